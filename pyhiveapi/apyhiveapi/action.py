@@ -78,19 +78,15 @@ class HiveAction:
         Returns:
             boolean: True/False if successful.
         """
-        import json
-
         final = False
 
         if device["hiveID"] in self.session.data.actions:
             await self.session.hiveRefreshTokens()
             data = self.session.data.actions[device["hiveID"]]
             data.update({"enabled": True})
-            send = json.dumps(data)
-            resp = await self.session.api.setAction(device["hiveID"], send)
+            resp = await self.session.sendAction(device["hiveID"], data)
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -103,18 +99,14 @@ class HiveAction:
         Returns:
             boolean: True/False if successful.
         """
-        import json
-
         final = False
 
         if device["hiveID"] in self.session.data.actions:
             await self.session.hiveRefreshTokens()
             data = self.session.data.actions[device["hiveID"]]
             data.update({"enabled": False})
-            send = json.dumps(data)
-            resp = await self.session.api.setAction(device["hiveID"], send)
+            resp = await self.session.sendAction(device["hiveID"], data)
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
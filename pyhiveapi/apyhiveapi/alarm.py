@@ -93,33 +93,22 @@ class Alarm(HiveHomeShield):
         device["deviceData"].update(
             {"online": await self.session.attr.onlineOffline(device["device_id"])}
         )
-        dev_data = {}
 
         if device["deviceData"]["online"]:
             self.session.helper.deviceRecovered(device["device_id"])
             data = self.session.data.devices[device["device_id"]]
-            dev_data = {
-                "hiveID": device["hiveID"],
-                "hiveName": device["hiveName"],
-                "hiveType": device["hiveType"],
-                "haName": device["haName"],
-                "haType": device["haType"],
-                "device_id": device["device_id"],
-                "device_name": device["device_name"],
-                "status": {
-                    "state": await self.getState(device),
-                    "mode": await self.getMode(),
-                },
-                "deviceData": data.get("props", None),
-                "parentDevice": data.get("parent", None),
-                "custom": device.get("custom", None),
-                "attributes": await self.session.attr.stateAttributes(
-                    device["device_id"], device["hiveType"]
-                ),
-            }
-
-            self.session.devices.update({device["hiveID"]: dev_data})
-            return self.session.devices[device["hiveID"]]
+            status = device.setdefault("status", {})
+            status["state"] = await self.getState(device)
+            status["mode"] = await self.getMode()
+            device["deviceData"] = data.get("props", None)
+            device["parentDevice"] = data.get("parent", None)
+            device["custom"] = device.get("custom", None)
+            device["attributes"] = await self.session.attr.stateAttributes(
+                device["device_id"], device["hiveType"]
+            )
+
+            self.session.devices[device["hiveID"]] = device
+            return device
         else:
             await self.session.log.errorCheck(
                 device["device_id"], "ERROR", device["deviceData"]["online"]
@@ -1,9 +1,10 @@
 """Hive API Module."""
 import json
 
-import requests
 import urllib3
-from pyquery import PyQuery
+
+from ..helper.hive_login_cache import LOGIN_CACHE, parseLoginInfo
+from .hive_pool import HivePool
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -11,7 +12,7 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class HiveApi:
     """Hive API Code."""
 
-    def __init__(self, hiveSession=None, websession=None, token=None):
+    def __init__(self, hiveSession=None, websession=None, token=None, pool=None):
         """Hive API initialisation."""
         self.urls = {
             "properties": "https://sso.hivehome.com/",
@@ -39,6 +40,10 @@ class HiveApi:
             "parsed": "No response to Hive API request",
         }
         self.session = hiveSession
+        self.websession = websession
+        self.ownsSession = websession is None and pool is None
+        if websession is None:
+            self.websession = (pool or HivePool()).getRequestsSession()
         self.token = token
 
     def request(self, type, url, jsc=None):
@@ -51,11 +56,11 @@ class HiveApi:
             self.headers.update({"authorization": self.token})
 
         if type == "GET":
-            return requests.get(
+            return self.websession.get(
                 url=url, headers=self.headers, data=jsc, timeout=self.timeout
             )
         if type == "POST":
-            return requests.post(
+            return self.websession.post(
                 url=url, headers=self.headers, data=jsc, timeout=self.timeout
             )
 
@@ -87,23 +92,21 @@ class HiveApi:
 
     def getLoginInfo(self):
         """Get login properties to make the login request."""
+        if LOGIN_CACHE.needsLoad():
+            LOGIN_CACHE.load()
+
+        loginData = LOGIN_CACHE.get()
+        if loginData is not None:
+            return loginData
+
         url = self.urls["properties"]
         try:
-            data = requests.get(url=url, verify=False, timeout=self.timeout)
-            html = PyQuery(data.content)
-            json_data = json.loads(
-                '{"'
-                + (html("script:first").text())
-                .replace(",", ', "')
-                .replace("=", '":')
-                .replace("window.", "")
-                + "}"
-            )
-
-            loginData = {}
-            loginData.update({"UPID": json_data["HiveSSOPoolId"]})
-            loginData.update({"CLIID": json_data["HiveSSOPublicCognitoClientId"]})
-            loginData.update({"REGION": json_data["HiveSSOPoolId"]})
+            data = self.websession.get(url=url, verify=False, timeout=self.timeout)
+            loginData = parseLoginInfo(data.text)
+            if loginData is None:
+                return LOGIN_CACHE.get(stale=True)
+            LOGIN_CACHE.set(loginData)
+            LOGIN_CACHE.save()
             return loginData
         except (OSError, RuntimeError, ZeroDivisionError):
             self.error()
@@ -229,7 +232,7 @@ class HiveApi:
 
     def setAction(self, n_id, data):
         """Set the state of a Action."""
-        jsc = data
+        jsc = data if isinstance(data, str) else json.dumps(data)
         url = self.urls["base"] + self.urls["actions"] + "/" + n_id
         try:
             response = self.request("POST", url, jsc)
@@ -240,6 +243,11 @@ class HiveApi:
 
         return self.json_return
 
+    def close(self):
+        """Close the websession if it is not shared."""
+        if self.ownsSession:
+            self.websession.close()
+
     def error(self):
         """An error has occurred interacting with the Hive API."""
         self.json_return.update({"original": "Error making API call"})
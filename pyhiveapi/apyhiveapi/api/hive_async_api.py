@@ -1,16 +1,31 @@
 """Hive API Module."""
 
-import json
+import asyncio
 import operator
 from typing import Optional
+from urllib.parse import urlsplit
 
-import requests
 import urllib3
-from aiohttp import ClientResponse, ClientSession, web_exceptions
-from pyquery import PyQuery
+from aiohttp import (
+    ClientConnectorError,
+    ClientError,
+    ClientSession,
+    ClientTimeout,
+    web_exceptions,
+)
 
 from ..helper.const import HTTP_UNAUTHORIZED
-from ..helper.hive_exceptions import FileInUse, NoApiToken
+from ..helper.hive_exceptions import (
+    FileInUse,
+    HiveApiError,
+    HiveCircuitOpen,
+    NoApiToken,
+)
+from ..helper.hive_json import dumps, loads
+from ..helper.hive_login_cache import LOGIN_CACHE, parseLoginInfo
+from .hive_breaker import HiveCircuitBreaker
+from .hive_pool import HivePool
+from .hive_retry import RETRY_STATUSES, HiveRetryPolicy
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -18,7 +33,12 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 class HiveApiAsync:
     """Hive API Code."""
 
-    def __init__(self, hiveSession=None, websession: Optional[ClientSession] = None):
+    def __init__(
+        self,
+        hiveSession=None,
+        websession: Optional[ClientSession] = None,
+        pool: Optional[HivePool] = None,
+    ):
         """Hive API initialisation."""
         self.baseUrl = "https://beekeeper.hivehome.com/1.0"
         self.urls = {
@@ -40,36 +60,110 @@ class HiveApiAsync:
             "Accept": "*/*",
         }
         self.timeout = 10
-        self.json_return = {
-            "original": "No response to Hive API request",
-            "parsed": "No response to Hive API request",
+        self.retryPolicies = {
+            "poll": HiveRetryPolicy(retries=3),
+            "write": HiveRetryPolicy(retries=2, exceptions=(ClientConnectorError,)),
         }
+        self.breakerSettings = {"failureThreshold": 5, "resetTimeout": 30.0}
+        self.breakers = {}
         self.session = hiveSession
-        self.websession = ClientSession() if websession is None else websession
-
-    async def request(self, method: str, url: str, **kwargs) -> ClientResponse:
-        """Make a request."""
+        self.pool = None
+        self.websession = websession
+        if websession is None:
+            self.pool = pool or HivePool()
+            self.websession = self.pool.acquire()
+
+    async def close(self):
+        """Close the websession if it came from a pool."""
+        if self.pool is not None and self.websession is not None:
+            self.websession = None
+            await self.pool.release()
+
+    async def request(self, method: str, url: str, **kwargs) -> dict:
+        """Make a request.
+
+        Each request uses its own headers and returns its own response, so
+        requests on one session can run concurrently. Failed requests are
+        retried using the retry policy for the call class, which is "poll"
+        for GET requests and "write" otherwise unless callClass is given.
+
+        Each endpoint has a circuit breaker, which opens once requests to the
+        endpoint keep failing after their retries. Requests to an endpoint
+        with an open breaker are not sent.
+
+        Raises:
+            HiveCircuitOpen: The circuit breaker for the endpoint is open.
+            HiveApiError: The connection failed or timed out after the retries.
+
+        Returns:
+            dict: Status of the response as original and its body as parsed.
+        """
         data = kwargs.get("data", None)
+        headers = dict(self.headers)
 
         try:
-            self.headers.update(
-                {"authorization": self.session.tokens.tokenData["token"]}
-            )
+            token = kwargs.get("token") or self.session.getAuthToken()
+            headers["authorization"] = token
         except KeyError:
             if "sso" in url:
                 pass
             else:
                 raise NoApiToken
 
-        async with self.websession.request(
-            method, url, headers=self.headers, data=data
-        ) as resp:
-            await resp.json(content_type=None)
-            self.json_return.update({"original": resp.status})
-            self.json_return.update({"parsed": await resp.json(content_type=None)})
+        policy = self.retryPolicies[
+            kwargs.get("callClass") or ("poll" if method.lower() == "get" else "write")
+        ]
+        breaker = self.getBreaker(kwargs.get("endpoint") or urlsplit(url).path)
+        if not breaker.allow():
+            raise HiveCircuitOpen
+
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                try:
+                    async with self.websession.request(
+                        method,
+                        url,
+                        headers=headers,
+                        data=data,
+                        timeout=ClientTimeout(total=self.timeout),
+                    ) as resp:
+                        body = await resp.read()
+                except policy.exceptions:
+                    if attempt > policy.retries:
+                        raise
+                    await asyncio.sleep(policy.backoff(attempt))
+                    continue
+
+                wait = policy.delay(
+                    attempt, resp.status, resp.headers.get("Retry-After")
+                )
+                if wait is None:
+                    break
+                await asyncio.sleep(wait)
+        except (ClientError, asyncio.TimeoutError) as err:
+            breaker.failure()
+            raise HiveApiError from err
+        except BaseException:
+            breaker.release()
+            raise
+
+        if resp.status in RETRY_STATUSES:
+            breaker.failure()
+        else:
+            breaker.success()
+
+        try:
+            parsed = loads(body)
+        except ValueError:
+            if operator.contains(str(resp.status), "20"):
+                raise
+            parsed = None
+        response = {"original": resp.status, "parsed": parsed}
 
         if operator.contains(str(resp.status), "20"):
-            return True
+            return response
         elif resp.status == HTTP_UNAUTHORIZED:
             self.session.logger.error(
                 f"Hive token has expired when calling {url} - "
@@ -81,25 +175,65 @@ class HiveApiAsync:
                 f"HTTP status is - {resp.status}"
             )
 
-    def getLoginInfo(self):
-        """Get login properties to make the login request."""
-        url = "https://sso.hivehome.com/"
-
-        data = requests.get(url=url, verify=False, timeout=self.timeout)
-        html = PyQuery(data.content)
-        json_data = json.loads(
-            '{"'
-            + (html("script:first").text())
-            .replace(",", ', "')
-            .replace("=", '":')
-            .replace("window.", "")
-            + "}"
-        )
+        return response
+
+    def getBreaker(self, endpoint: str):
+        """Get the circuit breaker for an endpoint.
+
+        Args:
+            endpoint (str): Name of the endpoint.
+
+        Returns:
+            HiveCircuitBreaker: Circuit breaker for the endpoint.
+        """
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = HiveCircuitBreaker(**self.breakerSettings)
+            self.breakers[endpoint] = breaker
+        return breaker
+
+    async def getLoginInfo(self):
+        """Get login properties to make the login request.
+
+        The properties are cached, and concurrent callers share one fetch.
+        If the fetch fails, expired cached properties are used if there are any.
+        """
+        if LOGIN_CACHE.needsLoad():
+            await asyncio.get_running_loop().run_in_executor(None, LOGIN_CACHE.load)
+
+        data = LOGIN_CACHE.get()
+        if data is not None:
+            return data
+
+        pending = LOGIN_CACHE.pending
+        if (
+            pending is None
+            or pending.done()
+            or pending.get_loop() is not asyncio.get_running_loop()
+        ):
+            pending = asyncio.ensure_future(self.fetchLoginInfo())
+            LOGIN_CACHE.pending = pending
+
+        try:
+            return dict(await asyncio.shield(pending))
+        except (ClientError, asyncio.TimeoutError, HiveApiError):
+            data = LOGIN_CACHE.get(stale=True)
+            if data is None:
+                raise
+            return data
+
+    async def fetchLoginInfo(self):
+        """Fetch login properties from the Hive SSO page."""
+        async with self.websession.get(
+            self.urls["properties"], timeout=ClientTimeout(total=self.timeout)
+        ) as resp:
+            html = await resp.text()
 
-        loginData = {}
-        loginData.update({"UPID": json_data["HiveSSOPoolId"]})
-        loginData.update({"CLIID": json_data["HiveSSOPublicCognitoClientId"]})
-        loginData.update({"REGION": json_data["HiveSSOPoolId"]})
+        loginData = parseLoginInfo(html)
+        if loginData is None:
+            raise HiveApiError
+        LOGIN_CACHE.set(loginData)
+        await asyncio.get_running_loop().run_in_executor(None, LOGIN_CACHE.save)
         return loginData
 
     async def refreshTokens(self):
@@ -107,18 +241,12 @@ class HiveApiAsync:
         url = self.urls["refresh"]
         if self.session is not None:
             tokens = self.session.tokens.tokenData
-        jsc = (
-            "{"
-            + ",".join(
-                ('"' + str(i) + '": ' '"' + str(t) + '" ' for i, t in tokens.items())
-            )
-            + "}"
-        )
+        jsc = dumps({str(i): str(t) for i, t in tokens.items()})
         try:
-            await self.request("post", url, data=jsc)
+            resp = await self.request("post", url, data=jsc, endpoint="refresh")
 
-            if self.json_return["original"] == 200:
-                info = self.json_return["parsed"]
+            if resp["original"] == 200:
+                info = resp["parsed"]
                 if "token" in info:
                     await self.session.updateTokens(info)
                     self.urls.update({"base": info["platform"]["endpoint"]})
@@ -127,57 +255,74 @@ class HiveApiAsync:
         except (ConnectionError, OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
+
+    async def getLongLivedToken(self):
+        """Request a long lived access token using the Cognito token."""
+        url = self.urls["long_lived"]
+        jsc = dumps({"accessTokens": [{}]})
+        try:
+            resp = await self.request(
+                "post",
+                url,
+                data=jsc,
+                token=self.session.tokens.tokenData["token"],
+                endpoint="long_lived",
+            )
+        except (OSError, RuntimeError, ZeroDivisionError):
+            await self.error()
+
+        return resp
 
     async def getAll(self):
         """Build and query all endpoint."""
         url = self.urls["all"]
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="all")
         except (OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def getAlarm(self):
         """Build and query alarm endpoint."""
         url = self.urls["alarm"] + self.session.config.homeID
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="alarm")
         except (OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def getDevices(self):
         """Call the get devices endpoint."""
         url = self.urls["devices"]
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="devices")
         except (OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def getProducts(self):
         """Call the get products endpoint."""
         url = self.urls["products"]
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="products")
         except (OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def getActions(self):
         """Call the get actions endpoint."""
         url = self.urls["actions"]
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="actions")
         except (OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def motionSensor(self, sensor, fromepoch, toepoch):
         """Call a way to get motion sensor info."""
@@ -194,81 +339,69 @@ class HiveApiAsync:
             + str(toepoch)
         )
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="events")
         except (OSError, RuntimeError, ZeroDivisionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def getWeather(self, weather_url):
         """Call endpoint to get local weather from Hive API."""
         t_url = self.urls["weather"] + weather_url
         url = t_url.replace(" ", "%20")
         try:
-            await self.request("get", url)
+            resp = await self.request("get", url, endpoint="weather")
         except (OSError, RuntimeError, ZeroDivisionError, ConnectionError):
             await self.error()
 
-        return self.json_return
+        return resp
 
     async def setState(self, n_type, n_id, **kwargs):
         """Set the state of a Device."""
-        jsc = (
-            "{"
-            + ",".join(
-                ('"' + str(i) + '": ' '"' + str(t) + '" ' for i, t in kwargs.items())
-            )
-            + "}"
-        )
+        jsc = dumps({str(i): str(t) for i, t in kwargs.items()})
 
         url = self.urls["nodes"].format(n_type, n_id)
         try:
             await self.isFileBeingUsed()
-            await self.request("post", url, data=jsc)
+            resp = await self.request("post", url, data=jsc, endpoint="nodes")
         except (FileInUse, OSError, RuntimeError, ConnectionError) as e:
             if e.__class__.__name__ == "FileInUse":
                 return {"original": "file"}
             else:
                 await self.error()
 
-        return self.json_return
+        return resp
 
     async def setAlarm(self, **kwargs):
         """Set the state of the alarm."""
-        jsc = (
-            "{"
-            + ",".join(
-                ('"' + str(i) + '": ' '"' + str(t) + '" ' for i, t in kwargs.items())
-            )
-            + "}"
-        )
+        jsc = dumps({str(i): str(t) for i, t in kwargs.items()})
 
         url = f"{self.urls['alarm']}{self.session.config.homeID}"
         try:
             await self.isFileBeingUsed()
-            await self.request("post", url, data=jsc)
+            resp = await self.request("post", url, data=jsc, endpoint="alarm")
         except (FileInUse, OSError, RuntimeError, ConnectionError) as e:
             if e.__class__.__name__ == "FileInUse":
                 return {"original": "file"}
             else:
                 await self.error()
 
-        return self.json_return
+        return resp
 
     async def setAction(self, n_id, data):
         """Set the state of a Action."""
-        jsc = data
+        jsc = data if isinstance(data, str) else dumps(data)
         url = self.urls["base"] + self.urls["actions"] + "/" + n_id
         try:
             await self.isFileBeingUsed()
-            await self.request("put", url, data=jsc)
+            resp = await self.request("put", url, data=jsc, endpoint="actions")
         except (FileInUse, OSError, RuntimeError, ConnectionError) as e:
             if e.__class__.__name__ == "FileInUse":
                 return {"original": "file"}
             else:
                 await self.error()
 
-        return self.json_return
+        return resp
 
     async def error(self):
         """An error has occurred iteracting with the Hive API."""
@@ -16,6 +16,7 @@ from ..helper.hive_exceptions import (
     HiveInvalid2FACode,
     HiveInvalidPassword,
     HiveInvalidUsername,
+    HiveReauthRequired,
 )
 from .hive_api import HiveApi
 
@@ -73,6 +74,8 @@ class HiveAuth:
         password: str,
         pool_region: str = None,
         client_secret: str = None,
+        websession: object = None,
+        backend: str = None,
     ):
         """Intilaise Sync Hive Auth.
 
@@ -81,6 +84,8 @@ class HiveAuth:
             password (str): [description]
             pool_region (str, optional): [description]. Defaults to None.
             client_secret (str, optional): [description]. Defaults to None.
+            websession (object, optional): Websession for api calls. Defaults to None.
+            backend (str, optional): Cognito client to use, only boto3 is supported. Defaults to None.
 
         Raises:
             ValueError: pool_region and client should not both be specified.
@@ -90,6 +95,8 @@ class HiveAuth:
                 "pool_region and client should not both be specified "
                 "(region should be passed to the boto3 client instead)"
             )
+        if backend not in (None, "boto3"):
+            raise ValueError(f"Unknown auth backend {backend}")
 
         self.username = username
         self.password = password
@@ -315,7 +322,7 @@ class HiveAuth:
             )
         except botocore.exceptions.ClientError as err:
             if err.__class__.__name__ == "NotAuthorizedException":
-                raise HiveInvalid2FACode
+                raise HiveReauthRequired
         except botocore.exceptions.EndpointConnectionError as err:
             if err.__class__.__name__ == "EndpointConnectionError":
                 raise HiveApiError
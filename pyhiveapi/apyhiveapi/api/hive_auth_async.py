@@ -8,19 +8,24 @@ import datetime
 import functools
 import hashlib
 import hmac
+import importlib.util
+import multiprocessing
 import os
 import re
+from typing import Optional
 
-import boto3
-import botocore
+from aiohttp import ClientSession
 
 from ..helper.hive_exceptions import (
     HiveApiError,
+    HiveCognitoError,
     HiveInvalid2FACode,
     HiveInvalidPassword,
     HiveInvalidUsername,
+    HiveReauthRequired,
 )
-from .hive_api import HiveApi
+from .hive_async_api import HiveApiAsync
+from .hive_cognito_async import HiveCognitoAsync
 
 # https://github.com/aws/amazon-cognito-identity-js/blob/master/src/AuthenticationHelper.js#L22
 n_hex = (
@@ -44,47 +49,112 @@ n_hex = (
 # https://github.com/aws/amazon-cognito-identity-js/blob/master/src/AuthenticationHelper.js#L49
 g_hex = "2"
 info_bits = bytearray("Caldera Derived Key", "utf-8")
-pool = concurrent.futures.ThreadPoolExecutor()
 
 
 class HiveAuthAsync:
-    """Async api to interface with hive auth."""
+    """Async api to interface with hive auth.
+
+    Cognito is called through boto3 when it is installed. Set backend to
+    "native" to call Cognito directly over the websession instead, which
+    avoids importing boto3 and using executor threads for each request.
+    Without a websession, one is opened for each call and closed after it,
+    so nothing needs to be closed when the auth object is dropped.
+
+    The SRP calculations run in the executor given, or in the shared
+    srp_runner, which moves them to a process pool when many logins are
+    in flight.
+    """
 
     NEW_PASSWORD_REQUIRED_CHALLENGE = "NEW_PASSWORD_REQUIRED"
     PASSWORD_VERIFIER_CHALLENGE = "PASSWORD_VERIFIER"
     SMS_MFA_CHALLENGE = "SMS_MFA"
 
-    def __init__(self, username, password, pool_region=None, client_secret=None):
+    def __init__(
+        self,
+        username,
+        password,
+        pool_region=None,
+        client_secret=None,
+        websession: Optional[ClientSession] = None,
+        backend: str = None,
+        executor: concurrent.futures.Executor = None,
+    ):
         """Initialise async auth."""
         if pool_region is not None:
             raise ValueError(
                 "pool_region and client should not both be specified "
                 "(region should be passed to the boto3 client instead)"
             )
+        if backend not in (None, "boto3", "native"):
+            raise ValueError(f"Unknown auth backend {backend}")
 
         self.loop = asyncio.get_event_loop()
         self.username = username
         self.password = password
-        self.api = HiveApi()
         self.user_id = "user_id"
         self.client_secret = client_secret
-        self.big_n = hex_to_long(n_hex)
-        self.g = hex_to_long(g_hex)
-        self.k = hex_to_long(hex_hash("00" + n_hex + "0" + g_hex))
-        self.small_a_value = self.generate_random_small_a()
-        self.large_a_value = self.calculate_a()
+        self.client = None
+        self.websession = websession
+        self.backend = backend or (
+            "boto3" if importlib.util.find_spec("boto3") else "native"
+        )
+        self.executor = executor
+        self.big_n = big_n
+        self.g = g_value
+        self.k = k_value
+        self.small_a_value = None
+        self.large_a_value = None
         self.useFile = True if self.username == "use@file.com" else False
         self.file_response = {"AuthenticationResult": {"AccessToken": "file"}}
 
     async def async_init(self):
         """Initialise async variables."""
-        self.data = await self.loop.run_in_executor(None, self.api.getLoginInfo)
+        websession = self.websession or ClientSession()
+        try:
+            self.data = await HiveApiAsync(websession=websession).getLoginInfo()
+        finally:
+            if websession is not self.websession:
+                await websession.close()
         self.__pool_id = self.data.get("UPID")
         self.__client_id = self.data.get("CLIID")
         self.__region = self.data.get("REGION").split("_")[0]
-        self.client = await self.loop.run_in_executor(
-            None, boto3.client, "cognito-idp", self.__region
-        )
+        if self.backend == "native":
+            self.client = HiveCognitoAsync(self.__region, self.websession)
+        else:
+            self.client = await self.loop.run_in_executor(
+                None, boto3_client, self.__region
+            )
+
+    async def call(self, operation: str, errors: dict, **kwargs):
+        """Call a Cognito operation.
+
+        Args:
+            operation (str): Name of the cognito-idp client method.
+            errors (dict): Exceptions to raise keyed by Cognito error code.
+
+        Raises:
+            HiveApiError: Cognito could not be reached or returned an unexpected error.
+
+        Returns:
+            dict: Response from Cognito.
+        """
+        if self.backend == "native":
+            try:
+                return await getattr(self.client, operation)(**kwargs)
+            except HiveCognitoError as err:
+                raise errors.get(err.args[0], HiveApiError) from err
+
+        import botocore
+
+        try:
+            return await self.loop.run_in_executor(
+                None, functools.partial(getattr(self.client, operation), **kwargs)
+            )
+        except botocore.exceptions.ClientError as err:
+            code = err.response.get("Error", {}).get("Code")
+            raise errors.get(code, HiveApiError) from err
+        except botocore.exceptions.EndpointConnectionError as err:
+            raise HiveApiError from err
 
     def generate_random_small_a(self):
         """
@@ -119,34 +189,37 @@ class HiveAuthAsync:
         :param {Long integer} salt Generated salt.
         :return {Buffer} Computed HKDF value.
         """
-        server_b_value = hex_to_long(server_b_value)
-        u_value = calculate_u(self.large_a_value, server_b_value)
-        if u_value == 0:
-            raise ValueError("U cannot be zero.")
-        username_password = "{}{}:{}".format(
-            self.__pool_id.split("_")[1],
+        return password_authentication_key(
+            self.__pool_id,
+            self.small_a_value,
+            self.large_a_value,
             username,
             password,
+            server_b_value,
+            salt,
         )
-        username_password_hash = hash_sha256(username_password.encode("utf-8"))
-
-        x_value = hex_to_long(hex_hash(pad_hex(salt) + username_password_hash))
-        g_mod_pow_xn = pow(self.g, x_value, self.big_n)
-        int_value2 = server_b_value - self.k * g_mod_pow_xn
-        s_value = pow(int_value2, self.small_a_value + u_value * x_value, self.big_n)
-        hkdf = compute_hkdf(
-            bytearray.fromhex(pad_hex(s_value)),
-            bytearray.fromhex(pad_hex(long_to_hex(u_value))),
-        )
-        return hkdf
+
+    async def run_srp(self, func, *args):
+        """Run an SRP calculation in the executor.
+
+        Args:
+            func (callable): Module level function to run.
+            args: Arguments for the function.
+
+        Returns:
+            any: Result of the function.
+        """
+        if self.executor is not None:
+            return await self.loop.run_in_executor(self.executor, func, *args)
+
+        return await srp_runner.run(self.loop, func, *args)
 
     async def get_auth_params(self):
         """Get auth params."""
+        self.small_a_value, self.large_a_value = await self.run_srp(generate_a_values)
         auth_params = {
             "USERNAME": self.username,
-            "SRP_A": await self.loop.run_in_executor(
-                None, long_to_hex, self.large_a_value
-            ),
+            "SRP_A": long_to_hex(self.large_a_value),
         }
         if self.client_secret is not None:
             auth_params.update(
@@ -177,9 +250,11 @@ class HiveAuthAsync:
             r" \1 ",
             datetime.datetime.utcnow().strftime("%a %b %d %H:%M:%S UTC %Y"),
         )
-        hkdf = await self.loop.run_in_executor(
-            None,
-            self.get_password_authentication_key,
+        hkdf = await self.run_srp(
+            password_authentication_key,
+            self.__pool_id,
+            self.small_a_value,
+            self.large_a_value,
             self.user_id,
             self.password,
             srp_b_hex,
@@ -218,45 +293,25 @@ class HiveAuthAsync:
 
         await self.async_init()
         auth_params = await self.get_auth_params()
-        response = None
-        result = None
-        try:
-            response = await self.loop.run_in_executor(
-                None,
-                functools.partial(
-                    self.client.initiate_auth,
-                    AuthFlow="USER_SRP_AUTH",
-                    AuthParameters=auth_params,
-                    ClientId=self.__client_id,
-                ),
-            )
-        except botocore.exceptions.ClientError as err:
-            if err.__class__.__name__ == "UserNotFoundException":
-                raise HiveInvalidUsername
-        except botocore.exceptions.EndpointConnectionError as err:
-            if err.__class__.__name__ == "EndpointConnectionError":
-                raise HiveApiError
+        response = await self.call(
+            "initiate_auth",
+            {"UserNotFoundException": HiveInvalidUsername},
+            AuthFlow="USER_SRP_AUTH",
+            AuthParameters=auth_params,
+            ClientId=self.__client_id,
+        )
 
         if response["ChallengeName"] == self.PASSWORD_VERIFIER_CHALLENGE:
             challenge_response = await self.process_challenge(
                 response["ChallengeParameters"]
             )
-            try:
-                result = await self.loop.run_in_executor(
-                    None,
-                    functools.partial(
-                        self.client.respond_to_auth_challenge,
-                        ClientId=self.__client_id,
-                        ChallengeName=self.PASSWORD_VERIFIER_CHALLENGE,
-                        ChallengeResponses=challenge_response,
-                    ),
-                )
-            except botocore.exceptions.ClientError as err:
-                if err.__class__.__name__ == "NotAuthorizedException":
-                    raise HiveInvalidPassword
-            except botocore.exceptions.EndpointConnectionError as err:
-                if err.__class__.__name__ == "EndpointConnectionError":
-                    raise HiveApiError
+            result = await self.call(
+                "respond_to_auth_challenge",
+                {"NotAuthorizedException": HiveInvalidPassword},
+                ClientId=self.__client_id,
+                ChallengeName=self.PASSWORD_VERIFIER_CHALLENGE,
+                ChallengeResponses=challenge_response,
+            )
 
             return result
         else:
@@ -268,59 +323,154 @@ class HiveAuthAsync:
         """Send sms code for auth."""
         session = challenge_parameters.get("Session")
         code = str(entered_code)
-        result = None
-        try:
-            result = await self.loop.run_in_executor(
-                None,
-                functools.partial(
-                    self.client.respond_to_auth_challenge,
-                    ClientId=self.__client_id,
-                    ChallengeName=self.SMS_MFA_CHALLENGE,
-                    Session=session,
-                    ChallengeResponses={
-                        "SMS_MFA_CODE": code,
-                        "USERNAME": self.user_id,
-                    },
-                ),
-            )
-        except botocore.exceptions.ClientError as err:
-            if (
-                err.__class__.__name__ == "NotAuthorizedException"
-                or err.__class__.__name__ == "CodeMismatchException"
-            ):
-                raise HiveInvalid2FACode
-        except botocore.exceptions.EndpointConnectionError as err:
-            if err.__class__.__name__ == "EndpointConnectionError":
-                raise HiveApiError
+        result = await self.call(
+            "respond_to_auth_challenge",
+            {
+                "NotAuthorizedException": HiveInvalid2FACode,
+                "CodeMismatchException": HiveInvalid2FACode,
+            },
+            ClientId=self.__client_id,
+            ChallengeName=self.SMS_MFA_CHALLENGE,
+            Session=session,
+            ChallengeResponses={
+                "SMS_MFA_CODE": code,
+                "USERNAME": self.user_id,
+            },
+        )
 
         return result
 
     async def refreshToken(self, refresh_token):
-        """Send sms code for auth."""
-        result = None
-        try:
-            result = await self.loop.run_in_executor(
-                None,
-                functools.partial(
-                    self.client.initiate_auth,
-                    ClientId=self.__client_id,
-                    AuthFlow="REFRESH_TOKEN_AUTH",
-                    AuthParameters={"REFRESH_TOKEN": refresh_token},
-                ),
-            )
-        except botocore.exceptions.ClientError as err:
-            if (
-                err.__class__.__name__ == "NotAuthorizedException"
-                or err.__class__.__name__ == "CodeMismatchException"
-            ):
-                raise HiveInvalid2FACode
-        except botocore.exceptions.EndpointConnectionError as err:
-            if err.__class__.__name__ == "EndpointConnectionError":
-                raise HiveApiError
+        """Refresh tokens.
+
+        Raises:
+            HiveReauthRequired: The refresh token has expired or been revoked.
+        """
+        if self.client is None:
+            await self.async_init()
+
+        result = await self.call(
+            "initiate_auth",
+            {"NotAuthorizedException": HiveReauthRequired},
+            ClientId=self.__client_id,
+            AuthFlow="REFRESH_TOKEN_AUTH",
+            AuthParameters={"REFRESH_TOKEN": refresh_token},
+        )
 
         return result
 
 
+class SrpRunner:
+    """Run SRP calculations away from the event loop.
+
+    The calculations use the default thread pool, or a process pool once
+    threshold logins are in flight so they can use more than one core.
+    Set executor to run them in a specific executor instead. The process
+    pool uses the spawn start method, so scripts that log in many accounts
+    at once need an if __name__ == "__main__" guard.
+    """
+
+    def __init__(self, threshold: int = 4, executor=None):
+        """Initialise the runner.
+
+        Args:
+            threshold (int, optional): Calculations in flight before the process pool is used. Defaults to 4.
+            executor (concurrent.futures.Executor, optional): Executor to always use. Defaults to None.
+        """
+        self.threshold = threshold
+        self.executor = executor
+        self.process_pool = None
+        self.in_flight = 0
+
+    def get_executor(self):
+        """Get the executor for the next calculation.
+
+        Returns:
+            concurrent.futures.Executor: Executor to use, None for the default one.
+        """
+        if self.executor is not None:
+            return self.executor
+        if self.in_flight < self.threshold:
+            return None
+        if self.process_pool is None:
+            self.process_pool = concurrent.futures.ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self.process_pool
+
+    async def run(self, loop, func, *args):
+        """Run a calculation.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Event loop to run it from.
+            func (callable): Module level function to run.
+            args: Arguments for the function.
+
+        Returns:
+            any: Result of the function.
+        """
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self.get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+
+
+def generate_a_values():
+    """Generate the client's random small a and public value A."""
+    small_a = get_random(128) % big_n
+    big_a = pow(g_value, small_a, big_n)
+    # safety check
+    if (big_a % big_n) == 0:
+        raise ValueError("Safety check for A failed")
+    return small_a, big_a
+
+
+def password_authentication_key(
+    pool_id, small_a, big_a, username, password, server_b_value, salt
+):
+    """
+    Calculates the final hkdf based on computed S value, \
+        and computed U value and the key.
+
+    :param {String} pool_id Cognito user pool ID.
+    :param {Long integer} small_a Client's random small a.
+    :param {Long integer} big_a Client's public value A.
+    :param {String} username Username.
+    :param {String} password Password.
+    :param {Long integer} server_b_value Server B value.
+    :param {Long integer} salt Generated salt.
+    :return {Buffer} Computed HKDF value.
+    """
+    server_b_value = hex_to_long(server_b_value)
+    u_value = calculate_u(big_a, server_b_value)
+    if u_value == 0:
+        raise ValueError("U cannot be zero.")
+    username_password = "{}{}:{}".format(
+        pool_id.split("_")[1],
+        username,
+        password,
+    )
+    username_password_hash = hash_sha256(username_password.encode("utf-8"))
+
+    x_value = hex_to_long(hex_hash(pad_hex(salt) + username_password_hash))
+    g_mod_pow_xn = pow(g_value, x_value, big_n)
+    int_value2 = server_b_value - k_value * g_mod_pow_xn
+    s_value = pow(int_value2, small_a + u_value * x_value, big_n)
+    hkdf = compute_hkdf(
+        bytearray.fromhex(pad_hex(s_value)),
+        bytearray.fromhex(pad_hex(long_to_hex(u_value))),
+    )
+    return hkdf
+
+
+def boto3_client(region):
+    """Create a boto3 cognito-idp client, importing boto3 when first needed."""
+    import boto3
+
+    return boto3.client("cognito-idp", region)
+
+
 def hex_to_long(hex_string):
     """Convert hex to long number."""
     return int(hex_string, 16)
@@ -379,3 +529,9 @@ def compute_hkdf(ikm, salt):
     info_bits_update = info_bits + bytearray(chr(1), "utf-8")
     hmac_hash = hmac.new(prk, info_bits_update, hashlib.sha256).digest()
     return hmac_hash[:16]
+
+
+big_n = hex_to_long(n_hex)
+g_value = hex_to_long(g_hex)
+k_value = hex_to_long(hex_hash("00" + n_hex + "0" + g_hex))
+srp_runner = SrpRunner()
@@ -0,0 +1,95 @@
+"""Circuit breaker for Hive API endpoints."""
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class HiveCircuitBreaker:
+    """Stop calling an endpoint while it keeps failing.
+
+    The breaker opens after failureThreshold failures in a row, and requests
+    fail fast while it is open. Once resetTimeout has passed one request is
+    let through to try the endpoint again, which closes the breaker if it
+    succeeds and opens it again if it fails.
+    """
+
+    def __init__(self, failureThreshold: int = 5, resetTimeout: float = 30.0):
+        """Initialise the circuit breaker.
+
+        Args:
+            failureThreshold (int, optional): Failures in a row that open the breaker. Defaults to 5.
+            resetTimeout (float, optional): Seconds to stay open before a trial request. Defaults to 30.0.
+        """
+        self.failureThreshold = failureThreshold
+        self.resetTimeout = resetTimeout
+        self.state = CLOSED
+        self.failures = 0
+        self.openedAt = None
+        self.trialSent = False
+
+    def allow(self):
+        """Check if a request can be sent.
+
+        Returns:
+            boolean: True if the request can be sent, False to fail fast.
+        """
+        if self.state == OPEN:
+            if time.monotonic() - self.openedAt < self.resetTimeout:
+                return False
+            self.state = HALF_OPEN
+            self.trialSent = False
+
+        if self.state == HALF_OPEN:
+            if self.trialSent:
+                return False
+            self.trialSent = True
+
+        return True
+
+    def success(self):
+        """Record a request that succeeded."""
+        self.state = CLOSED
+        self.failures = 0
+        self.openedAt = None
+        self.trialSent = False
+
+    def failure(self):
+        """Record a request that failed."""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failureThreshold:
+            self.state = OPEN
+            self.openedAt = time.monotonic()
+            self.trialSent = False
+
+    def release(self):
+        """Record a request that ended without a result.
+
+        A trial request that was cancelled or failed for another reason
+        does not say anything about the endpoint, so the next request is
+        let through as the trial instead.
+        """
+        self.trialSent = False
+
+    def retryIn(self):
+        """Get the seconds until a trial request can be sent.
+
+        Returns:
+            float: Seconds to wait, 0.0 if requests can be sent now.
+        """
+        if self.state != OPEN:
+            return 0.0
+        return max(self.resetTimeout - (time.monotonic() - self.openedAt), 0.0)
+
+    def status(self):
+        """Get the state of the breaker for monitoring.
+
+        Returns:
+            dict: State, failures in a row and seconds until a trial request.
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retryIn": self.retryIn(),
+        }
@@ -0,0 +1,78 @@
+"""Cognito identity provider client using aiohttp."""
+
+import asyncio
+import json
+
+from typing import Optional
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+from ..helper.hive_exceptions import HiveApiError, HiveCognitoError
+
+
+class HiveCognitoAsync:
+    """Call the Cognito identity provider JSON API over aiohttp.
+
+    The methods used for Hive auth take the same arguments and return the
+    same responses as the boto3 cognito-idp client.
+    """
+
+    def __init__(self, region: str, websession: Optional[ClientSession] = None):
+        """Initialise the Cognito client.
+
+        Args:
+            region (str): AWS region of the user pool.
+            websession (Optional[ClientSession], optional): Websession for api calls, a websession is opened and closed for each call if not given. Defaults to None.
+        """
+        self.url = f"https://cognito-idp.{region}.amazonaws.com/"
+        self.websession = websession
+        self.timeout = 10
+
+    async def request(self, action: str, payload: dict):
+        """Call a Cognito action.
+
+        Args:
+            action (str): Name of the action.
+            payload (dict): Parameters for the action.
+
+        Raises:
+            HiveApiError: Cognito could not be reached.
+            HiveCognitoError: Cognito returned an error, with its error code as the first argument.
+
+        Returns:
+            dict: Response from Cognito.
+        """
+        headers = {
+            "Content-Type": "application/x-amz-json-1.1",
+            "X-Amz-Target": "AWSCognitoIdentityProviderService." + action,
+        }
+        websession = self.websession or ClientSession()
+        try:
+            async with websession.post(
+                self.url,
+                data=json.dumps(payload),
+                headers=headers,
+                timeout=ClientTimeout(total=self.timeout),
+            ) as resp:
+                data = await resp.json(content_type=None)
+                status = resp.status
+        except (ClientError, asyncio.TimeoutError, ValueError) as err:
+            raise HiveApiError from err
+        finally:
+            if websession is not self.websession:
+                await websession.close()
+
+        data = data or {}
+        if status != 200:
+            code = data.get("__type", str(status)).rsplit("#", 1)[-1]
+            raise HiveCognitoError(code, data.get("message"))
+
+        return data
+
+    async def initiate_auth(self, **kwargs):
+        """Start an auth flow."""
+        return await self.request("InitiateAuth", kwargs)
+
+    async def respond_to_auth_challenge(self, **kwargs):
+        """Respond to an auth challenge."""
+        return await self.request("RespondToAuthChallenge", kwargs)
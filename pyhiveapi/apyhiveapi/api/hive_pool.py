@@ -0,0 +1,79 @@
+"""Connection pool shared by Hive sessions."""
+from typing import Optional
+
+import requests
+from aiohttp import ClientSession, TCPConnector
+from requests.adapters import HTTPAdapter
+
+
+class HivePool:
+    """Connection pool settings and the sessions built from them.
+
+    One pool can be passed to many Hive sessions so they share a small
+    number of keep-alive connections. The aiohttp session is created when
+    the first Hive session uses the pool, and is closed when the last one
+    is closed.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limitPerHost: int = 4,
+        keepAlive: float = 30.0,
+        dnsCacheTtl: Optional[int] = 300,
+    ):
+        """Initialise the pool.
+
+        Args:
+            limit (int, optional): Total number of connections. Defaults to 100.
+            limitPerHost (int, optional): Connections to each host. Defaults to 4.
+            keepAlive (float, optional): Seconds to keep idle connections open. Defaults to 30.0.
+            dnsCacheTtl (Optional[int], optional): Seconds to cache DNS results, None to cache forever. Defaults to 300.
+        """
+        self.limit = limit
+        self.limitPerHost = limitPerHost
+        self.keepAlive = keepAlive
+        self.dnsCacheTtl = dnsCacheTtl
+        self.websession = None
+        self.requestsSession = None
+        self.users = 0
+
+    def acquire(self):
+        """Get the aiohttp session for the pool.
+
+        Returns:
+            ClientSession: Session using the pooled connector.
+        """
+        if self.websession is None or self.websession.closed:
+            connector = TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limitPerHost,
+                keepalive_timeout=self.keepAlive,
+                ttl_dns_cache=self.dnsCacheTtl,
+                use_dns_cache=True,
+            )
+            self.websession = ClientSession(connector=connector)
+        self.users += 1
+        return self.websession
+
+    async def release(self):
+        """Stop using the aiohttp session, closing it if nothing else uses it."""
+        self.users = max(self.users - 1, 0)
+        if self.users == 0 and self.websession is not None:
+            await self.websession.close()
+            self.websession = None
+
+    def getRequestsSession(self):
+        """Get the requests session for the pool.
+
+        Returns:
+            requests.Session: Session using pooled connections.
+        """
+        if self.requestsSession is None:
+            adapter = HTTPAdapter(
+                pool_connections=self.limit, pool_maxsize=self.limitPerHost
+            )
+            self.requestsSession = requests.Session()
+            self.requestsSession.mount("https://", adapter)
+            self.requestsSession.mount("http://", adapter)
+        return self.requestsSession
@@ -0,0 +1,115 @@
+"""Retry policy for Hive API requests."""
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from aiohttp import ClientConnectionError
+
+from ..helper.const import (
+    HTTP_BAD_GATEWAY,
+    HTTP_INTERNAL_SERVER_ERROR,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
+
+RETRY_STATUSES = (
+    HTTP_TOO_MANY_REQUESTS,
+    HTTP_INTERNAL_SERVER_ERROR,
+    HTTP_BAD_GATEWAY,
+    HTTP_SERVICE_UNAVAILABLE,
+    504,
+)
+
+
+class HiveRetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    Delays grow exponentially from base up to cap, with full jitter. A
+    Retry-After header sets the delay instead, unless it is longer than
+    maxRetryAfter, in which case the request is not retried.
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        base: float = 0.5,
+        cap: float = 30.0,
+        maxRetryAfter: float = 60.0,
+        statuses: tuple = RETRY_STATUSES,
+        exceptions: tuple = (ClientConnectionError, asyncio.TimeoutError),
+    ):
+        """Initialise the retry policy.
+
+        Args:
+            retries (int, optional): Number of retries after the first attempt. Defaults to 3.
+            base (float, optional): Seconds to wait before the first retry. Defaults to 0.5.
+            cap (float, optional): Most seconds to wait between attempts. Defaults to 30.0.
+            maxRetryAfter (float, optional): Longest Retry-After to wait for. Defaults to 60.0.
+            statuses (tuple, optional): HTTP statuses to retry. Defaults to 429 and 5xx gateway errors.
+            exceptions (tuple, optional): Exceptions to retry. Defaults to connection errors and timeouts.
+        """
+        self.retries = retries
+        self.base = base
+        self.cap = cap
+        self.maxRetryAfter = maxRetryAfter
+        self.statuses = statuses
+        self.exceptions = exceptions
+
+    def backoff(self, attempt: int):
+        """Get the delay before a retry.
+
+        Args:
+            attempt (int): Number of attempts already made, starting at 1.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        return random.uniform(0, min(self.cap, self.base * 2 ** (attempt - 1)))
+
+    def delay(self, attempt: int, status: int = None, retryAfter: str = None):
+        """Get the delay before retrying a response.
+
+        Args:
+            attempt (int): Number of attempts already made, starting at 1.
+            status (int, optional): HTTP status of the response. Defaults to None.
+            retryAfter (str, optional): Retry-After header of the response. Defaults to None.
+
+        Returns:
+            float: Seconds to wait, or None if the response should not be retried.
+        """
+        if attempt > self.retries or status not in self.statuses:
+            return None
+
+        wait = self.parseRetryAfter(retryAfter)
+        if wait is None:
+            return self.backoff(attempt)
+        if wait > self.maxRetryAfter:
+            return None
+        return wait
+
+    @staticmethod
+    def parseRetryAfter(value: str):
+        """Get the seconds to wait from a Retry-After header.
+
+        Args:
+            value (str): Header value, either seconds or an HTTP date.
+
+        Returns:
+            float: Seconds to wait, or None if there is no valid value.
+        """
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -1,4 +1,5 @@
 """Hive Heating Module."""
+from datetime import datetime
 
 from .helper.const import HIVETOHA
 
@@ -47,50 +48,11 @@ class HiveHeating:
         Returns:
             float: current temperature
         """
-        from datetime import datetime
-
-        f_state = None
-        state = None
         final = None
 
         try:
             data = self.session.data.products[device["hiveID"]]
-            state = data["props"]["temperature"]
-
-            if device["hiveID"] in self.session.data.minMax:
-                if self.session.data.minMax[device["hiveID"]]["TodayDate"] == str(
-                    datetime.date(datetime.now())
-                ):
-                    if state < self.session.data.minMax[device["hiveID"]]["TodayMin"]:
-                        self.session.data.minMax[device["hiveID"]]["TodayMin"] = state
-
-                    if state > self.session.data.minMax[device["hiveID"]]["TodayMax"]:
-                        self.session.data.minMax[device["hiveID"]]["TodayMax"] = state
-                else:
-                    data = {
-                        "TodayMin": state,
-                        "TodayMax": state,
-                        "TodayDate": str(datetime.date(datetime.now())),
-                    }
-                    self.session.data.minMax[device["hiveID"]].update(data)
-
-                if state < self.session.data.minMax[device["hiveID"]]["RestartMin"]:
-                    self.session.data.minMax[device["hiveID"]]["RestartMin"] = state
-
-                if state > self.session.data.minMax[device["hiveID"]]["RestartMax"]:
-                    self.session.data.minMax[device["hiveID"]]["RestartMax"] = state
-            else:
-                data = {
-                    "TodayMin": state,
-                    "TodayMax": state,
-                    "TodayDate": str(datetime.date(datetime.now())),
-                    "RestartMin": state,
-                    "RestartMax": state,
-                }
-                self.session.data.minMax[device["hiveID"]] = data
-
-            f_state = round(float(state), 1)
-            final = f_state
+            final = round(float(data["props"]["temperature"]), 1)
         except KeyError as e:
             await self.session.log.error(e)
 
@@ -270,12 +232,11 @@ class HiveHeating:
         ):
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], target=new_temp
             )
 
             if resp["original"] == 200:
-                await self.session.getDevices(device["hiveID"])
                 final = True
 
         return final
@@ -298,12 +259,11 @@ class HiveHeating:
             and device["deviceData"]["online"]
         ):
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], mode=new_mode
             )
 
             if resp["original"] == 200:
-                await self.session.getDevices(device["hiveID"])
                 final = True
 
         return final
@@ -329,7 +289,7 @@ class HiveHeating:
                     and device["deviceData"]["online"]
                 ):
                     data = self.session.data.products[device["hiveID"]]
-                    resp = await self.session.api.setState(
+                    resp = await self.session.setState(
                         data["type"],
                         device["hiveID"],
                         mode="BOOST",
@@ -338,7 +298,6 @@ class HiveHeating:
                     )
 
                     if resp["original"] == 200:
-                        await self.session.getDevices(device["hiveID"])
                         final = True
 
                 return final
@@ -366,18 +325,17 @@ class HiveHeating:
                 prev_mode = data["props"]["previous"]["mode"]
                 if prev_mode == "MANUAL" or prev_mode == "OFF":
                     pre_temp = data["props"]["previous"].get("target", 7)
-                    resp = await self.session.api.setState(
+                    resp = await self.session.setState(
                         data["type"],
                         device["hiveID"],
                         mode=prev_mode,
                         target=pre_temp,
                     )
                 else:
-                    resp = await self.session.api.setState(
+                    resp = await self.session.setState(
                         data["type"], device["hiveID"], mode=prev_mode
                     )
                 if resp["original"] == 200:
-                    await self.session.getDevices(device["hiveID"])
                     final = True
 
         return final
@@ -400,12 +358,11 @@ class HiveHeating:
         ):
             data = self.session.data.products[device["hiveID"]]
             await self.session.hiveRefreshTokens()
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], autoBoost=state
             )
 
             if resp["original"] == 200:
-                await self.session.getDevices(device["hiveID"])
                 final = True
 
         return final
@@ -440,36 +397,24 @@ class Climate(HiveHeating):
         )
 
         if device["deviceData"]["online"]:
-            dev_data = {}
             self.session.helper.deviceRecovered(device["device_id"])
             data = self.session.data.devices[device["device_id"]]
-            dev_data = {
-                "hiveID": device["hiveID"],
-                "hiveName": device["hiveName"],
-                "hiveType": device["hiveType"],
-                "haName": device["haName"],
-                "haType": device["haType"],
-                "device_id": device["device_id"],
-                "device_name": device["device_name"],
-                "temperatureunit": device["temperatureunit"],
-                "min_temp": await self.getMinTemperature(device),
-                "max_temp": await self.getMaxTemperature(device),
-                "status": {
-                    "current_temperature": await self.getCurrentTemperature(device),
-                    "target_temperature": await self.getTargetTemperature(device),
-                    "action": await self.getCurrentOperation(device),
-                    "mode": await self.getMode(device),
-                    "boost": await self.getBoostStatus(device),
-                },
-                "deviceData": data.get("props", None),
-                "parentDevice": data.get("parent", None),
-                "custom": device.get("custom", None),
-                "attributes": await self.session.attr.stateAttributes(
-                    device["device_id"], device["hiveType"]
-                ),
-            }
-            self.session.devices.update({device["hiveID"]: dev_data})
-            return self.session.devices[device["hiveID"]]
+            device["min_temp"] = await self.getMinTemperature(device)
+            device["max_temp"] = await self.getMaxTemperature(device)
+            status = device.setdefault("status", {})
+            status["current_temperature"] = await self.getCurrentTemperature(device)
+            status["target_temperature"] = await self.getTargetTemperature(device)
+            status["action"] = await self.getCurrentOperation(device)
+            status["mode"] = await self.getMode(device)
+            status["boost"] = await self.getBoostStatus(device)
+            device["deviceData"] = data.get("props", None)
+            device["parentDevice"] = data.get("parent", None)
+            device["custom"] = device.get("custom", None)
+            device["attributes"] = await self.session.attr.stateAttributes(
+                device["device_id"], device["hiveType"]
+            )
+            self.session.devices[device["hiveID"]] = device
+            return device
         else:
             await self.session.log.errorCheck(
                 device["device_id"], "ERROR", device["deviceData"]["online"]
@@ -492,7 +437,56 @@ class Climate(HiveHeating):
         try:
             if online and current_mode == "SCHEDULE":
                 data = self.session.data.products[device["hiveID"]]
-                state = self.session.helper.getScheduleNNL(data["state"]["schedule"])
+                state = self.session.helper.getScheduleNNL(
+                    data["state"]["schedule"], device["hiveID"]
+                )
+        except KeyError as e:
+            await self.session.log.error(e)
+
+        return state
+
+    async def getScheduleTimeline(self, device: dict, start: datetime, end: datetime):
+        """Hive get heating schedule as steps between two times.
+
+        Args:
+            device (dict): Device to get schedule for.
+            start (datetime): Start of the time range.
+            end (datetime): End of the time range.
+
+        Returns:
+            list: Steps with their start, end and scheduled value.
+        """
+        state = None
+
+        try:
+            data = self.session.data.products[device["hiveID"]]
+            schedule = self.session.helper.getSchedule(
+                data["state"]["schedule"], device["hiveID"]
+            )
+            state = schedule.timeline(start, end)
+        except KeyError as e:
+            await self.session.log.error(e)
+
+        return state
+
+    async def getScheduleValues(self, device: dict, timestamps: list):
+        """Hive get heating scheduled value at each of a list of times.
+
+        Args:
+            device (dict): Device to get schedule for.
+            timestamps (list): Datetimes or epoch times to evaluate.
+
+        Returns:
+            list: Scheduled value at each time.
+        """
+        state = None
+
+        try:
+            data = self.session.data.products[device["hiveID"]]
+            schedule = self.session.helper.getSchedule(
+                data["state"]["schedule"], device["hiveID"]
+            )
+            state = schedule.valuesAt(timestamps)
         except KeyError as e:
             await self.session.log.error(e)
 
@@ -511,8 +505,27 @@ class Climate(HiveHeating):
         final = None
 
         try:
-            state = self.session.data.minMax[device["hiveID"]]
-            final = state
+            state = self.session.history[device["hiveID"]]
+            final = state.minMax()
+        except KeyError as e:
+            await self.session.log.error(e)
+
+        return final
+
+    async def getTemperatureStats(self, device: dict, window: str = "day"):
+        """Get rolling temperature stats.
+
+        Args:
+            device (dict): device to get temperature stats for.
+            window (str, optional): Name of the window. Defaults to "day".
+
+        Returns:
+            dict: Min, max and mean temperature over the window.
+        """
+        final = None
+
+        try:
+            final = self.session.history[device["hiveID"]].stats(window)
         except KeyError as e:
             await self.session.log.error(e)
 
@@ -54,103 +54,174 @@ HIVE_TYPES = {
     "Sensor": ["motionsensor", "contactsensor"],
     "Switch": ["activeplug"],
 }
+# Getter to call for each sensor type, given as the session attribute, the
+# method name and the device key to pass, or None to pass the device.
 sensor_commands = {
-    "SMOKE_CO": "self.session.hub.getSmokeStatus(device)",
-    "DOG_BARK": "self.session.hub.getDogBarkStatus(device)",
-    "GLASS_BREAK": "self.session.hub.getGlassBreakStatus(device)",
-    "Heating_Current_Temperature": "self.session.heating.getCurrentTemperature(device)",
-    "Heating_Target_Temperature": "self.session.heating.getTargetTemperature(device)",
-    "Heating_State": "self.session.heating.getState(device)",
-    "Heating_Mode": "self.session.heating.getMode(device)",
-    "Heating_Boost": "self.session.heating.getBoostStatus(device)",
-    "Hotwater_State": "self.session.hotwater.getState(device)",
-    "Hotwater_Mode": "self.session.hotwater.getMode(device)",
-    "Hotwater_Boost": "self.session.hotwater.getBoost(device)",
-    "Battery": 'self.session.attr.getBattery(device["device_id"])',
-    "Mode": 'self.session.attr.getMode(device["hiveID"])',
-    "Availability": "self.online(device)",
-    "Connectivity": "self.online(device)",
+    "SMOKE_CO": ("hub", "getSmokeStatus", None),
+    "DOG_BARK": ("hub", "getDogBarkStatus", None),
+    "GLASS_BREAK": ("hub", "getGlassBreakStatus", None),
+    "Heating_Current_Temperature": ("heating", "getCurrentTemperature", None),
+    "Heating_Target_Temperature": ("heating", "getTargetTemperature", None),
+    "Heating_State": ("heating", "getState", None),
+    "Heating_Mode": ("heating", "getMode", None),
+    "Heating_Boost": ("heating", "getBoostStatus", None),
+    "Hotwater_State": ("hotwater", "getState", None),
+    "Hotwater_Mode": ("hotwater", "getMode", None),
+    "Hotwater_Boost": ("hotwater", "getBoost", None),
+    "Battery": ("attr", "getBattery", "device_id"),
+    "Mode": ("attr", "getMode", "hiveID"),
+    "Availability": ("sensor", "online", None),
+    "Connectivity": ("sensor", "online", None),
 }
 
+# Entities to create for each node type. Each entry is the entity type, the
+# keyword arguments for addList and optionally keyword arguments read from
+# the node or session data, given as a path whose first item is "node" or a
+# key of session.data.
 PRODUCTS = {
     "sense": [
-        'addList("binary_sensor", p, haName="Glass Detection", hiveType="GLASS_BREAK")',
-        'addList("binary_sensor", p, haName="Smoke Detection", hiveType="SMOKE_CO")',
-        'addList("binary_sensor", p, haName="Dog Bark Detection", hiveType="DOG_BARK")',
+        ("binary_sensor", {"haName": "Glass Detection", "hiveType": "GLASS_BREAK"}),
+        ("binary_sensor", {"haName": "Smoke Detection", "hiveType": "SMOKE_CO"}),
+        ("binary_sensor", {"haName": "Dog Bark Detection", "hiveType": "DOG_BARK"}),
     ],
     "heating": [
-        'addList("climate", p, temperatureunit=self.data["user"]["temperatureUnit"])',
-        'addList("switch", p, haName=" Heat on Demand", hiveType="Heating_Heat_On_Demand")',
-        'addList("sensor", p, haName=" Current Temperature", hiveType="Heating_Current_Temperature", custom=True)',
-        'addList("sensor", p, haName=" Target Temperature", hiveType="Heating_Target_Temperature", custom=True)',
-        'addList("sensor", p, haName=" State", hiveType="Heating_State", custom=True)',
-        'addList("sensor", p, haName=" Mode", hiveType="Heating_Mode", custom=True)',
-        'addList("sensor", p, haName=" Boost", hiveType="Heating_Boost", custom=True)',
+        ("climate", {}, {"temperatureunit": ("user", "temperatureUnit")}),
+        ("switch", {"haName": " Heat on Demand", "hiveType": "Heating_Heat_On_Demand"}),
+        (
+            "sensor",
+            {
+                "haName": " Current Temperature",
+                "hiveType": "Heating_Current_Temperature",
+                "custom": True,
+            },
+        ),
+        (
+            "sensor",
+            {
+                "haName": " Target Temperature",
+                "hiveType": "Heating_Target_Temperature",
+                "custom": True,
+            },
+        ),
+        ("sensor", {"haName": " State", "hiveType": "Heating_State", "custom": True}),
+        ("sensor", {"haName": " Mode", "hiveType": "Heating_Mode", "custom": True}),
+        ("sensor", {"haName": " Boost", "hiveType": "Heating_Boost", "custom": True}),
     ],
     "trvcontrol": [
-        'addList("climate", p, temperatureunit=self.data["user"]["temperatureUnit"])',
-        'addList("sensor", p, haName=" Current Temperature", hiveType="Heating_Current_Temperature", custom=True)',
-        'addList("sensor", p, haName=" Target Temperature", hiveType="Heating_Target_Temperature", custom=True)',
-        'addList("sensor", p, haName=" State", hiveType="Heating_State", custom=True)',
-        'addList("sensor", p, haName=" Mode", hiveType="Heating_Mode", custom=True)',
-        'addList("sensor", p, haName=" Boost", hiveType="Heating_Boost", custom=True)',
+        ("climate", {}, {"temperatureunit": ("user", "temperatureUnit")}),
+        (
+            "sensor",
+            {
+                "haName": " Current Temperature",
+                "hiveType": "Heating_Current_Temperature",
+                "custom": True,
+            },
+        ),
+        (
+            "sensor",
+            {
+                "haName": " Target Temperature",
+                "hiveType": "Heating_Target_Temperature",
+                "custom": True,
+            },
+        ),
+        ("sensor", {"haName": " State", "hiveType": "Heating_State", "custom": True}),
+        ("sensor", {"haName": " Mode", "hiveType": "Heating_Mode", "custom": True}),
+        ("sensor", {"haName": " Boost", "hiveType": "Heating_Boost", "custom": True}),
     ],
     "hotwater": [
-        'addList("water_heater", p,)',
-        'addList("sensor", p, haName="Hotwater State", hiveType="Hotwater_State", custom=True)',
-        'addList("sensor", p, haName="Hotwater Mode", hiveType="Hotwater_Mode", custom=True)',
-        'addList("sensor", p, haName="Hotwater Boost", hiveType="Hotwater_Boost", custom=True)',
+        ("water_heater", {}),
+        (
+            "sensor",
+            {"haName": "Hotwater State", "hiveType": "Hotwater_State", "custom": True},
+        ),
+        (
+            "sensor",
+            {"haName": "Hotwater Mode", "hiveType": "Hotwater_Mode", "custom": True},
+        ),
+        (
+            "sensor",
+            {"haName": "Hotwater Boost", "hiveType": "Hotwater_Boost", "custom": True},
+        ),
     ],
     "activeplug": [
-        'addList("switch", p)',
-        'addList("sensor", p, haName=" Mode", hiveType="Mode", custom=True)',
-        'addList("sensor", p, haName=" Availability", hiveType="Availability", custom=True)',
+        ("switch", {}),
+        ("sensor", {"haName": " Mode", "hiveType": "Mode", "custom": True}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
     "warmwhitelight": [
-        'addList("light", p)',
-        'addList("sensor", p, haName=" Mode", hiveType="Mode", custom=True)',
-        'addList("sensor", p, haName=" Availability", hiveType="Availability", custom=True)',
+        ("light", {}),
+        ("sensor", {"haName": " Mode", "hiveType": "Mode", "custom": True}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
     "tuneablelight": [
-        'addList("light", p)',
-        'addList("sensor", p, haName=" Mode", hiveType="Mode", custom=True)',
-        'addList("sensor", p, haName=" Availability", hiveType="Availability", custom=True)',
+        ("light", {}),
+        ("sensor", {"haName": " Mode", "hiveType": "Mode", "custom": True}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
     "colourtuneablelight": [
-        'addList("light", p)',
-        'addList("sensor", p, haName=" Mode", hiveType="Mode", custom=True)',
-        'addList("sensor", p, haName=" Availability", hiveType="Availability", custom=True)',
+        ("light", {}),
+        ("sensor", {"haName": " Mode", "hiveType": "Mode", "custom": True}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
-    "motionsensor": ['addList("binary_sensor", p)'],
-    "contactsensor": ['addList("binary_sensor", p)'],
+    "motionsensor": [("binary_sensor", {})],
+    "contactsensor": [("binary_sensor", {})],
 }
 
 DEVICES = {
     "contactsensor": [
-        'addList("sensor", d, haName=" Battery Level", hiveType="Battery")',
-        'addList("sensor", d, haName=" Availability", hiveType="Availability", custom=True)',
+        ("sensor", {"haName": " Battery Level", "hiveType": "Battery"}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
     "hub": [
-        'addList("binary_sensor", d, haName="Hive Hub Status", hiveType="Connectivity")',
+        ("binary_sensor", {"haName": "Hive Hub Status", "hiveType": "Connectivity"}),
     ],
     "motionsensor": [
-        'addList("sensor", d, haName=" Battery Level", hiveType="Battery")',
-        'addList("sensor", d, haName=" Availability", hiveType="Availability", custom=True)',
+        ("sensor", {"haName": " Battery Level", "hiveType": "Battery"}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
     "sense": [
-        'addList("binary_sensor", d, haName="Hive Hub Status", hiveType="Connectivity")',
+        ("binary_sensor", {"haName": "Hive Hub Status", "hiveType": "Connectivity"}),
     ],
-    "siren": ['addList("alarm_control_panel", d)'],
+    "siren": [("alarm_control_panel", {})],
     "thermostatui": [
-        'addList("sensor", d, haName=" Battery Level", hiveType="Battery")',
-        'addList("sensor", d, haName=" Availability", hiveType="Availability", custom=True)',
+        ("sensor", {"haName": " Battery Level", "hiveType": "Battery"}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
     "trv": [
-        'addList("sensor", d, haName=" Battery Level", hiveType="Battery")',
-        'addList("sensor", d, haName=" Availability", hiveType="Availability", custom=True)',
+        ("sensor", {"haName": " Battery Level", "hiveType": "Battery"}),
+        (
+            "sensor",
+            {"haName": " Availability", "hiveType": "Availability", "custom": True},
+        ),
     ],
 }
 
-ACTIONS = (
-    'addList("switch", a, hiveName=a["name"], haName=a["name"], hiveType="action")'
-)
+ACTIONS = [
+    (
+        "switch",
+        {"hiveType": "action"},
+        {"hiveName": ("node", "name"), "haName": ("node", "name")},
+    )
+]
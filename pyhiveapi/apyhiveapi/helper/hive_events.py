@@ -0,0 +1,153 @@
+"""Hive change event module."""
+import asyncio
+import functools
+
+from .hivedataclasses import HiveChange, HiveEvent
+
+
+class HiveEvents:
+    """Publish node changes found between two polls.
+
+    Each watch() queue holds at most queueSize events, and the oldest event
+    is dropped when a watcher falls behind.
+    """
+
+    def __init__(self, session: object = None, queueSize: int = 1000):
+        """Initialise events.
+
+        Args:
+            session (object, optional): Session to interact with hive account. Defaults to None.
+            queueSize (int, optional): Most events to hold for each watcher. Defaults to 1000.
+        """
+        self.session = session
+        self.queueSize = queueSize
+        self.listeners = []
+        self.queues = []
+        self.tasks = set()
+
+    @property
+    def active(self):
+        """Check if anything is listening for events.
+
+        Returns:
+            boolean: True/False if there are any listeners.
+        """
+        return bool(self.listeners or self.queues)
+
+    def addListener(self, callback: callable):
+        """Register a callback to receive change events.
+
+        Args:
+            callback (callable): Function or coroutine function taking an event.
+
+        Returns:
+            callable: Function to remove the listener again.
+        """
+        self.listeners.append(callback)
+
+        def remove():
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+
+        return remove
+
+    async def watch(self):
+        """Async iterator of change events from the first iteration onwards.
+
+        Yields:
+            HiveEvent: Changes made to a node.
+        """
+        queue = asyncio.Queue(self.queueSize)
+        self.queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.queues.remove(queue)
+
+    def publish(self, nodeType: str, n_id: str, old: dict, new: dict):
+        """Publish the changes between two versions of a node.
+
+        Args:
+            nodeType (str): products, devices or actions.
+            n_id (str): ID of the node.
+            old (dict): Node from the previous poll, None if it is new.
+            new (dict): Node from the latest poll, None if it was removed.
+        """
+        changes = self.diff(old, new)
+        if not changes:
+            return
+
+        event = HiveEvent(n_id, nodeType, changes)
+        for queue in self.queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+        for callback in list(self.listeners):
+            try:
+                result = callback(event)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.ensure_future(result)
+                    self.tasks.add(task)
+                    task.add_done_callback(
+                        functools.partial(self.listenerDone, callback)
+                    )
+            except Exception as e:
+                self.listenerFailed(callback, e)
+
+    def listenerDone(self, callback: callable, task: asyncio.Task):
+        """Log the error of a coroutine listener once it has finished.
+
+        Args:
+            callback (callable): Listener the task was started for.
+            task (asyncio.Task): Task running the listener.
+        """
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.listenerFailed(callback, task.exception())
+
+    def listenerFailed(self, callback: callable, e: Exception):
+        """Log an error raised by a listener.
+
+        Args:
+            callback (callable): Listener that failed.
+            e (Exception): Error raised by the listener.
+        """
+        self.session.logger.error(
+            f"Hive event listener {callback} failed with {e.__class__} {e}"
+        )
+
+    async def close(self):
+        """Cancel listeners that are still running."""
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @classmethod
+    def diff(cls, old: object, new: object, path: tuple = ()):
+        """Get the values that differ between two nodes.
+
+        Args:
+            old (object): Previous value.
+            new (object): Latest value.
+            path (tuple, optional): Path to the values. Defaults to ().
+
+        Returns:
+            list: Changed values.
+        """
+        if isinstance(old, dict) and isinstance(new, dict):
+            changes = []
+            for key in new:
+                if key not in old:
+                    changes.append(HiveChange(path + (key,), None, new[key]))
+                elif old[key] != new[key]:
+                    changes.extend(cls.diff(old[key], new[key], path + (key,)))
+            for key in old:
+                if key not in new:
+                    changes.append(HiveChange(path + (key,), old[key], None))
+            return changes
+
+        if old == new:
+            return []
+        return [HiveChange(path, old, new)]
@@ -63,3 +63,19 @@ class HiveInvalid2FACode(Exception):
     Args:
         Exception (object): Exception object to invoke
     """
+
+
+class HiveCognitoError(Exception):
+    """Cognito has returned an error.
+
+    Args:
+        Exception (object): Exception object to invoke
+    """
+
+
+class HiveCircuitOpen(HiveApiError):
+    """Raise when a request is not sent because the endpoint keeps failing.
+
+    Args:
+        HiveApiError (object): Exception object to invoke
+    """
@@ -0,0 +1,55 @@
+"""Entity factories compiled from the entity tables in const."""
+
+from .const import ACTIONS, DEVICES, PRODUCTS
+
+
+def compileEntity(haType: str, kwargs: dict, sources: dict = None):
+    """Compile an entity table entry into a function that adds the entity.
+
+    Args:
+        haType (str): Type of entity.
+        kwargs (dict): Keyword arguments for addList.
+        sources (dict, optional): Keyword arguments read from the node or session data. Defaults to None.
+
+    Returns:
+        function: Function taking the session and node that adds the entity.
+    """
+    if not sources:
+
+        def build(session, node):
+            return session.addList(haType, node, **kwargs)
+
+        return build
+
+    paths = [(key, path[0], path[1:]) for key, path in sources.items()]
+
+    def build(session, node):
+        values = dict(kwargs)
+        for key, root, path in paths:
+            value = node if root == "node" else session.data[root]
+            for part in path:
+                value = value[part]
+            values[key] = value
+        return session.addList(haType, node, **values)
+
+    return build
+
+
+def compileEntities(table: dict):
+    """Compile an entity table into functions that add the entities.
+
+    Args:
+        table (dict): Entries to compile for each node type.
+
+    Returns:
+        dict: Functions to call for each node type.
+    """
+    return {
+        nodeType: tuple(compileEntity(*entry) for entry in entries)
+        for nodeType, entries in table.items()
+    }
+
+
+PRODUCT_ENTITIES = compileEntities(PRODUCTS)
+DEVICE_ENTITIES = compileEntities(DEVICES)
+ACTION_ENTITIES = tuple(compileEntity(*entry) for entry in ACTIONS)
@@ -1,8 +1,11 @@
 """Helper class for pyhiveapi."""
+import base64
 import datetime
-import operator
+import json
 
 from .const import HIVE_TYPES
+from .hive_history import HiveTemperatureHistory
+from .hive_schedule import HiveSchedule
 
 
 class HiveHelper:
@@ -15,6 +18,7 @@ class HiveHelper:
             session (object, optional): Interact with hive account. Defaults to None.
         """
         self.session = session
+        self.schedules = {}
 
     def getDeviceName(self, n_id: str):
         """Resolve a id into a name.
@@ -83,16 +87,9 @@ class HiveHelper:
         device = product
         type = product["type"]
         if type in ("heating", "hotwater"):
-            for aDevice in self.session.data.devices:
-                if self.session.data.devices[aDevice]["type"] in HIVE_TYPES["Thermo"]:
-                    try:
-                        if (
-                            product["props"]["zone"]
-                            == self.session.data.devices[aDevice]["props"]["zone"]
-                        ):
-                            device = self.session.data.devices[aDevice]
-                    except KeyError:
-                        pass
+            zone = product.get("props", {}).get("zone")
+            if zone in self.session.zones:
+                device = self.session.data.devices[self.session.zones[zone]]
         elif type == "trvcontrol":
             device = self.session.data.devices[product["props"]["trvs"][0]]
         elif type == "warmwhitelight" and product["props"]["model"] == "SIREN001":
@@ -104,95 +101,193 @@ class HiveHelper:
 
         return device
 
-    def convertMinutesToTime(self, minutes_to_convert: str):
-        """Convert minutes string to datetime.
+    def updateZones(self, devices: dict, changed: list, removed: set):
+        """Update the index of thermostat devices by zone.
 
         Args:
-            minutes_to_convert (str): minutes in string value.
+            devices (dict): Devices held by the session.
+            changed (list): IDs of devices that were added or changed.
+            removed (set): IDs of devices that were removed.
+        """
+        zones = self.session.zones
+        stale = removed.union(changed)
+        if zones and stale:
+            for zone in [zone for zone, n_id in zones.items() if n_id in stale]:
+                del zones[zone]
+
+        for n_id in changed:
+            device = devices[n_id]
+            if device["type"] in HIVE_TYPES["Thermo"]:
+                zone = device.get("props", {}).get("zone")
+                if zone is not None:
+                    zones[zone] = n_id
+
+    def recordTemperatures(self, timestamp: float = None):
+        """Add the current temperature of each heating product to its history.
 
-        Returns:
-            timedelta: time object of the minutes.
+        Args:
+            timestamp (float, optional): Epoch time of the samples. Defaults to None.
         """
-        hours_converted, minutes_converted = divmod(minutes_to_convert, 60)
-        converted_time = datetime.datetime.strptime(
-            str(hours_converted) + ":" + str(minutes_converted), "%H:%M"
-        )
-        converted_time_string = converted_time.strftime("%H:%M")
-        return converted_time_string
+        timestamp = timestamp or datetime.datetime.now().timestamp()
+        history = self.session.history
+        settings = self.session.config.temperatureHistory
+        for n_id, product in self.session.data.products.items():
+            if product["type"] not in HIVE_TYPES["Heating"]:
+                continue
+            temperature = product.get("props", {}).get("temperature")
+            if temperature is None:
+                continue
+            if n_id not in history:
+                history[n_id] = HiveTemperatureHistory(
+                    settings["size"], settings["windows"]
+                )
+            history[n_id].add(timestamp, temperature)
 
-    def getScheduleNNL(self, hive_api_schedule: list):
-        """Get the schedule now, next and later of a given nodes schedule.
+    def applyState(self, n_id: str, state: dict):
+        """Apply state that was successfully sent to a product.
 
         Args:
-            hive_api_schedule (list): Schedule to parse.
+            n_id (str): ID of the product.
+            state (dict): State values that were sent.
+        """
+        product = self.session.data.products.get(n_id)
+        if product is None:
+            return
+
+        current = product.setdefault("state", {})
+        previous = dict(product, state=dict(current))
+        if state.get("mode") == "BOOST" and current.get("mode") != "BOOST":
+            previous["props"] = dict(product.get("props", {}))
+            product.setdefault("props", {})["previous"] = {
+                key: current[key] for key in ("mode", "target") if key in current
+            }
+
+        for key, value in state.items():
+            current[key] = self.parseValue(value)
+
+        if self.session.events.active:
+            self.session.events.publish("products", n_id, previous, product)
+
+    @staticmethod
+    def getTokenClaims(token: str):
+        """Get the claims from a JWT without verifying it.
+
+        Args:
+            token (str): Token to read.
 
         Returns:
-            dict: Now, Next and later values.
+            dict: Claims in the token, empty if it could not be read.
         """
-        schedule_now_and_next = {}
-        date_time_now = datetime.datetime.now()
-        date_time_now_day_int = date_time_now.today().weekday()
-
-        days_t = (
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "saturday",
-            "sunday",
-        )
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return json.loads(base64.urlsafe_b64decode(payload))
+        except (AttributeError, IndexError, TypeError, ValueError):
+            return {}
 
-        days_rolling_list = list(days_t[date_time_now_day_int:] + days_t)[:7]
+    def getLongLivedToken(self, response: dict):
+        """Get a long lived token and its expiry from an API response.
 
-        full_schedule_list = []
+        Args:
+            response (dict): Parsed response from the long lived token endpoint.
 
-        for day_index in range(0, len(days_rolling_list)):
-            current_day_schedule = hive_api_schedule[days_rolling_list[day_index]]
-            current_day_schedule_sorted = sorted(
-                current_day_schedule,
-                key=operator.itemgetter("start"),
-                reverse=False,
+        Returns:
+            tuple: Token and expiry time, either of which may be None.
+        """
+        entry = response
+        if isinstance(response, dict) and response.get("accessTokens"):
+            entry = response["accessTokens"][0]
+        if not isinstance(entry, dict):
+            return None, None
+
+        token = entry.get("token") or entry.get("accessToken")
+        if not isinstance(token, str):
+            return None, None
+
+        expiry = None
+        if entry.get("expiryTime"):
+            seconds = float(entry["expiryTime"])
+            expiry = datetime.datetime.fromtimestamp(
+                seconds / 1000 if seconds > 1e11 else seconds
+            )
+        elif entry.get("expiresIn"):
+            expiry = datetime.datetime.now() + datetime.timedelta(
+                seconds=float(entry["expiresIn"])
             )
+        elif "exp" in self.getTokenClaims(token):
+            expiry = datetime.datetime.fromtimestamp(self.getTokenClaims(token)["exp"])
 
-            for current_slot in range(0, len(current_day_schedule_sorted)):
-                current_slot_custom = current_day_schedule_sorted[current_slot]
+        return token, expiry
 
-                slot_date = datetime.datetime.now() + datetime.timedelta(days=day_index)
-                slot_time = self.convertMinutesToTime(current_slot_custom["start"])
-                slot_time_date_s = slot_date.strftime("%d-%m-%Y") + " " + slot_time
-                slot_time_date_dt = datetime.datetime.strptime(
-                    slot_time_date_s, "%d-%m-%Y %H:%M"
-                )
-                if slot_time_date_dt <= date_time_now:
-                    slot_time_date_dt = slot_time_date_dt + datetime.timedelta(days=7)
+    @staticmethod
+    def parseValue(value: any):
+        """Convert a value sent as a string back to a number.
+
+        Args:
+            value (any): Value to convert.
+
+        Returns:
+            any: Converted value.
+        """
+        if isinstance(value, str):
+            for convert in (int, float):
+                try:
+                    return convert(value)
+                except ValueError:
+                    pass
+        return value
+
+    def convertMinutesToTime(self, minutes_to_convert: str):
+        """Convert minutes string to datetime.
 
-                current_slot_custom["Start_DateTime"] = slot_time_date_dt
-                full_schedule_list.append(current_slot_custom)
+        Args:
+            minutes_to_convert (str): minutes in string value.
 
-        fsl_sorted = sorted(
-            full_schedule_list,
-            key=operator.itemgetter("Start_DateTime"),
-            reverse=False,
+        Returns:
+            timedelta: time object of the minutes.
+        """
+        hours_converted, minutes_converted = divmod(minutes_to_convert, 60)
+        converted_time = datetime.datetime.strptime(
+            str(hours_converted) + ":" + str(minutes_converted), "%H:%M"
         )
+        converted_time_string = converted_time.strftime("%H:%M")
+        return converted_time_string
+
+    def getSchedule(self, hive_api_schedule: dict, n_id: str = None):
+        """Get the compiled form of a nodes schedule.
 
-        schedule_now = fsl_sorted[-1]
-        schedule_next = fsl_sorted[0]
-        schedule_later = fsl_sorted[1]
+        The compiled schedule is kept per node and only rebuilt when the
+        schedule changes.
 
-        schedule_now["Start_DateTime"] = schedule_now[
-            "Start_DateTime"
-        ] - datetime.timedelta(days=7)
+        Args:
+            hive_api_schedule (dict): Schedule to compile.
+            n_id (str, optional): ID of the node the schedule belongs to. Defaults to None.
 
-        schedule_now["End_DateTime"] = schedule_next["Start_DateTime"]
-        schedule_next["End_DateTime"] = schedule_later["Start_DateTime"]
-        schedule_later["End_DateTime"] = fsl_sorted[2]["Start_DateTime"]
+        Returns:
+            HiveSchedule: Compiled schedule.
+        """
+        compiled = self.schedules.get(n_id) if n_id is not None else None
+        if compiled is None or (
+            compiled.source is not hive_api_schedule
+            and compiled.source != hive_api_schedule
+        ):
+            compiled = HiveSchedule(hive_api_schedule)
+            if n_id is not None:
+                self.schedules[n_id] = compiled
+
+        return compiled
+
+    def getScheduleNNL(self, hive_api_schedule: dict, n_id: str = None):
+        """Get the schedule now, next and later of a given nodes schedule.
 
-        schedule_now_and_next["now"] = schedule_now
-        schedule_now_and_next["next"] = schedule_next
-        schedule_now_and_next["later"] = schedule_later
+        Args:
+            hive_api_schedule (dict): Schedule to parse.
+            n_id (str, optional): ID of the node the schedule belongs to. Defaults to None.
 
-        return schedule_now_and_next
+        Returns:
+            dict: Now, Next and later values.
+        """
+        return self.getSchedule(hive_api_schedule, n_id).nowNextLater()
 
     def getHeatOnDemandDevice(self, device: dict):
         """Use TRV device to get the linked thermostat device.
@@ -0,0 +1,166 @@
+"""Hive temperature history module."""
+from array import array
+from collections import deque
+from datetime import datetime
+
+
+class HiveTemperatureHistory:
+    """Fixed size ring buffer of temperature samples for a heating node.
+
+    Rolling min, max and mean are kept for each configured window so they
+    can be read without scanning the samples.
+    """
+
+    def __init__(self, size: int = 1440, windows: dict = None):
+        """Initialise temperature history.
+
+        Args:
+            size (int, optional): Number of samples to keep. Defaults to 1440.
+            windows (dict, optional): Window length in seconds keyed by name. Defaults to None.
+        """
+        self.size = size
+        self.windows = dict(windows or {"hour": 3600, "day": 86400})
+        self.times = array("d", bytes(8 * size))
+        self.temperatures = array("d", bytes(8 * size))
+        self.total = 0
+        self.rolling = {
+            name: {"start": 0, "sum": 0.0, "min": deque(), "max": deque()}
+            for name in self.windows
+        }
+        self.todayDate = None
+        self.todayMin = None
+        self.todayMax = None
+        self.restartMin = None
+        self.restartMax = None
+
+    def __len__(self):
+        """Get the number of samples held."""
+        return min(self.total, self.size)
+
+    def add(self, timestamp: float, temperature: float):
+        """Add a temperature sample.
+
+        Args:
+            timestamp (float): Epoch time of the sample.
+            temperature (float): Temperature at that time.
+        """
+        temperature = float(temperature)
+        sequence = self.total
+        oldest = sequence + 1 - self.size
+
+        for name, seconds in self.windows.items():
+            window = self.rolling[name]
+            cutoff = timestamp - seconds
+            start = window["start"]
+            while start < sequence and (
+                start < oldest or self.times[start % self.size] <= cutoff
+            ):
+                window["sum"] -= self.temperatures[start % self.size]
+                start += 1
+            window["start"] = start
+            for extreme in (window["min"], window["max"]):
+                while extreme and extreme[0] < start:
+                    extreme.popleft()
+
+        index = sequence % self.size
+        self.times[index] = timestamp
+        self.temperatures[index] = temperature
+        self.total = sequence + 1
+
+        for window in self.rolling.values():
+            window["sum"] += temperature
+            lowest = window["min"]
+            while lowest and self.temperatures[lowest[-1] % self.size] >= temperature:
+                lowest.pop()
+            lowest.append(sequence)
+            highest = window["max"]
+            while highest and self.temperatures[highest[-1] % self.size] <= temperature:
+                highest.pop()
+            highest.append(sequence)
+
+        today = datetime.fromtimestamp(timestamp).date()
+        if today != self.todayDate:
+            self.todayDate = today
+            self.todayMin = self.todayMax = temperature
+        else:
+            self.todayMin = min(self.todayMin, temperature)
+            self.todayMax = max(self.todayMax, temperature)
+
+        if self.restartMin is None:
+            self.restartMin = self.restartMax = temperature
+        else:
+            self.restartMin = min(self.restartMin, temperature)
+            self.restartMax = max(self.restartMax, temperature)
+
+    def stats(self, name: str):
+        """Get the rolling min, max and mean for a window.
+
+        Args:
+            name (str): Name of the window.
+
+        Returns:
+            dict: Min, max, mean and number of samples in the window.
+        """
+        window = self.rolling[name]
+        count = self.total - window["start"]
+        if count == 0:
+            return {"min": None, "max": None, "mean": None, "count": 0}
+
+        return {
+            "min": self.temperatures[window["min"][0] % self.size],
+            "max": self.temperatures[window["max"][0] % self.size],
+            "mean": window["sum"] / count,
+            "count": count,
+        }
+
+    def minMax(self):
+        """Get the min and max temperature for today and since restart.
+
+        Returns:
+            dict: Min and max temperatures.
+        """
+        return {
+            "TodayMin": self.todayMin,
+            "TodayMax": self.todayMax,
+            "TodayDate": str(self.todayDate),
+            "RestartMin": self.restartMin,
+            "RestartMax": self.restartMax,
+        }
+
+    def samples(self):
+        """Get the samples held from oldest to newest.
+
+        Returns:
+            list: Timestamp and temperature of each sample.
+        """
+        return [
+            [self.times[sequence % self.size], self.temperatures[sequence % self.size]]
+            for sequence in range(self.total - len(self), self.total)
+        ]
+
+    def toDict(self):
+        """Get the history in a form that can be saved as JSON.
+
+        Returns:
+            dict: Size, windows and samples.
+        """
+        return {"size": self.size, "windows": self.windows, "samples": self.samples()}
+
+    @classmethod
+    def fromDict(cls, data: dict):
+        """Restore history saved with toDict.
+
+        The since restart min and max only cover samples added after the
+        history is restored.
+
+        Args:
+            data (dict): Saved history.
+
+        Returns:
+            HiveTemperatureHistory: Restored history.
+        """
+        history = cls(data["size"], data["windows"])
+        for timestamp, temperature in data["samples"]:
+            history.add(timestamp, temperature)
+        history.restartMin = history.restartMax = None
+        return history
@@ -0,0 +1,63 @@
+"""JSON backend for Hive API requests."""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def stdlibLoads(data: bytes):
+    """Decode JSON with the standard library."""
+    return json.loads(data)
+
+
+def stdlibDumps(data: any):
+    """Encode JSON with the standard library."""
+    return json.dumps(data, separators=(",", ":"))
+
+
+def orjsonDumps(data: any):
+    """Encode JSON with orjson."""
+    return orjson.dumps(data).decode("utf-8")
+
+
+backend = {"loads": stdlibLoads, "dumps": stdlibDumps}
+if orjson is not None:
+    backend.update(loads=orjson.loads, dumps=orjsonDumps)
+
+
+def setJsonBackend(loads: callable, dumps: callable):
+    """Set the functions used to decode and encode JSON.
+
+    Args:
+        loads (callable): Decodes bytes to Python objects.
+        dumps (callable): Encodes Python objects to a string.
+    """
+    backend.update(loads=loads, dumps=dumps)
+
+
+def loads(data: bytes):
+    """Decode a JSON response body.
+
+    Args:
+        data (bytes): Raw response body.
+
+    Returns:
+        any: Decoded body, or None if the body is empty.
+    """
+    if not data or data.isspace():
+        return None
+    return backend["loads"](data)
+
+
+def dumps(data: any):
+    """Encode a JSON request body.
+
+    Args:
+        data (any): Data to encode.
+
+    Returns:
+        str: Encoded body.
+    """
+    return backend["dumps"](data)
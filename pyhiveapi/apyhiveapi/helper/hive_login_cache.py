@@ -0,0 +1,126 @@
+"""Cache for the Hive login properties."""
+import json
+import os
+import re
+import time
+
+LOGIN_KEYS = {"UPID": "HiveSSOPoolId", "CLIID": "HiveSSOPublicCognitoClientId"}
+
+
+def parseLoginInfo(html: str):
+    """Get the login properties from the Hive SSO page.
+
+    Args:
+        html (str): Content of the SSO page.
+
+    Returns:
+        dict: Pool ID, client ID and region, or None if they were not found.
+    """
+    loginData = {}
+    for key, name in LOGIN_KEYS.items():
+        match = re.search(name + r"\s*[=:]\s*[\"']([^\"']+)[\"']", html)
+        if match is None:
+            return None
+        loginData[key] = match.group(1)
+
+    loginData["REGION"] = loginData["UPID"]
+    return loginData
+
+
+class HiveLoginCache:
+    """Login properties kept in memory until they expire.
+
+    Set file to also keep them on disk between restarts. The file is only
+    read and written through load and save, so async callers can run them
+    in an executor.
+    """
+
+    def __init__(self, ttl: int = 86400, file: str = None):
+        """Initialise the cache.
+
+        Args:
+            ttl (int, optional): Seconds to keep the login properties. Defaults to 86400.
+            file (str, optional): File to keep the login properties in. Defaults to None.
+        """
+        self.ttl = ttl
+        self.file = file
+        self.loaded = False
+        self.data = None
+        self.fetched = 0
+        self.pending = None
+
+    def get(self, stale: bool = False):
+        """Get the cached login properties.
+
+        Args:
+            stale (bool, optional): Return the properties even if they have expired. Defaults to False.
+
+        Returns:
+            dict: Login properties, or None if there are none to use.
+        """
+        if self.data is None:
+            return None
+        if not stale and time.time() - self.fetched >= self.ttl:
+            return None
+
+        return dict(self.data)
+
+    def set(self, data: dict):
+        """Cache new login properties.
+
+        Args:
+            data (dict): Login properties.
+        """
+        self.data = dict(data)
+        self.fetched = time.time()
+
+    def setFile(self, file: str):
+        """Keep the login properties in a file.
+
+        Args:
+            file (str): File location, or None to only keep them in memory.
+        """
+        if file != self.file:
+            self.file = file
+            self.loaded = False
+
+    def needsLoad(self):
+        """Check if the cache file has properties that have not been loaded.
+
+        Returns:
+            boolean: True if load should be called before fetching.
+        """
+        return self.file is not None and not self.loaded and self.data is None
+
+    def load(self):
+        """Load login properties saved on disk."""
+        self.loaded = True
+        if self.file is None:
+            return
+
+        try:
+            with open(self.file) as j:
+                saved = json.load(j)
+            data = saved["data"]
+            if not all(key in data for key in ("UPID", "CLIID", "REGION")):
+                return
+            self.data = data
+            self.fetched = float(saved["fetched"])
+        except (OSError, KeyError, TypeError, ValueError):
+            pass
+
+    def save(self):
+        """Save the login properties to disk."""
+        if self.file is None or self.data is None:
+            return
+
+        temp = self.file + ".tmp"
+        try:
+            with open(temp, "w") as j:
+                json.dump({"fetched": self.fetched, "data": self.data}, j)
+            os.replace(temp, self.file)
+        except OSError:
+            pass
+
+
+LOGIN_CACHE = HiveLoginCache()
@@ -0,0 +1,164 @@
+"""Hive schedule module."""
+import datetime
+from bisect import bisect_right
+from operator import itemgetter
+
+DAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = MINUTES_PER_DAY * len(DAYS)
+
+
+class HiveSchedule:
+    """Weekly schedule compiled into sorted minute of week boundaries."""
+
+    def __init__(self, schedule: dict):
+        """Compile a weekly schedule.
+
+        Args:
+            schedule (dict): Schedule from the node state, keyed by day.
+        """
+        boundaries = []
+        for day, name in enumerate(DAYS):
+            for slot in schedule[name]:
+                boundaries.append((day * MINUTES_PER_DAY + slot["start"], slot))
+        boundaries.sort(key=itemgetter(0))
+
+        self.source = schedule
+        self.starts = [start for start, slot in boundaries]
+        self.slots = [slot for start, slot in boundaries]
+
+    def minuteOfWeek(self, date_time: datetime.datetime):
+        """Get the minute of the week of a date and time.
+
+        Args:
+            date_time (datetime): Date and time to convert.
+
+        Returns:
+            int: Minutes since midnight on Monday.
+        """
+        return (
+            date_time.weekday() * MINUTES_PER_DAY
+            + date_time.hour * 60
+            + date_time.minute
+        )
+
+    def nowNextLater(self, now: datetime.datetime = None):
+        """Get the slot running now and the next two slots.
+
+        Args:
+            now (datetime, optional): Time to use as now. Defaults to None.
+
+        Returns:
+            dict: Now, Next and later slots with their start and end times.
+        """
+        if not self.starts:
+            return None
+
+        now = now or datetime.datetime.now()
+        minute = self.minuteOfWeek(now)
+        base = now.replace(second=0, microsecond=0)
+        index = bisect_right(self.starts, minute)
+        count = len(self.starts)
+
+        def nextStart(position):
+            offset = self.starts[position % count] - minute
+            if offset <= 0:
+                offset += MINUTES_PER_WEEK
+            return base + datetime.timedelta(minutes=offset)
+
+        starts = [nextStart(index + position) for position in range(3)]
+        now_start = nextStart(index - 1) - datetime.timedelta(minutes=MINUTES_PER_WEEK)
+
+        schedule_now = dict(self.slots[(index - 1) % count])
+        schedule_now["Start_DateTime"] = now_start
+        schedule_now["End_DateTime"] = starts[0]
+        schedule_next = dict(self.slots[index % count])
+        schedule_next["Start_DateTime"] = starts[0]
+        schedule_next["End_DateTime"] = starts[1]
+        schedule_later = dict(self.slots[(index + 1) % count])
+        schedule_later["Start_DateTime"] = starts[1]
+        schedule_later["End_DateTime"] = starts[2]
+
+        return {"now": schedule_now, "next": schedule_next, "later": schedule_later}
+
+    def boundary(self, base: datetime.datetime, position: int):
+        """Get the start time of a slot counted from the start of a week.
+
+        Args:
+            base (datetime): Midnight on the Monday the count starts from.
+            position (int): Number of the slot, which can run into other weeks.
+
+        Returns:
+            datetime: Start time of the slot.
+        """
+        week, index = divmod(position, len(self.starts))
+        return base + datetime.timedelta(
+            minutes=week * MINUTES_PER_WEEK + self.starts[index]
+        )
+
+    def timeline(self, start: datetime.datetime, end: datetime.datetime):
+        """Get the scheduled values as steps between two times.
+
+        Args:
+            start (datetime): Start of the time range.
+            end (datetime): End of the time range.
+
+        Returns:
+            list: Steps with their start, end and scheduled value.
+        """
+        if not self.starts or end <= start:
+            return []
+
+        minute = self.minuteOfWeek(start)
+        base = start.replace(second=0, microsecond=0) - datetime.timedelta(
+            minutes=minute
+        )
+        position = bisect_right(self.starts, minute) - 1
+        count = len(self.starts)
+        steps = []
+        step_start = self.boundary(base, position)
+
+        while step_start < end:
+            step_end = self.boundary(base, position + 1)
+            if step_end > start and step_end > step_start:
+                steps.append(
+                    {
+                        "start": max(step_start, start),
+                        "end": min(step_end, end),
+                        "value": self.slots[position % count]["value"],
+                    }
+                )
+            step_start = step_end
+            position += 1
+
+        return steps
+
+    def valuesAt(self, timestamps: list):
+        """Get the scheduled value at each of a list of times.
+
+        Args:
+            timestamps (list): Datetimes or epoch times to evaluate.
+
+        Returns:
+            list: Scheduled value at each time.
+        """
+        if not self.starts:
+            return [None] * len(timestamps)
+
+        count = len(self.starts)
+        values = []
+        for timestamp in timestamps:
+            if not isinstance(timestamp, datetime.datetime):
+                timestamp = datetime.datetime.fromtimestamp(timestamp)
+            index = bisect_right(self.starts, self.minuteOfWeek(timestamp)) - 1
+            values.append(self.slots[index % count]["value"])
+
+        return values
@@ -0,0 +1,197 @@
+"""Encrypted on-disk store for Hive tokens."""
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+    InvalidToken = ValueError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ITERATIONS = 200000
+FILE_LOCKS = {}
+FILE_LOCKS_GUARD = threading.Lock()
+
+
+class HiveTokenStore:
+    """Keep encrypted tokens for many accounts on disk.
+
+    The path can be a file holding every account or a directory holding a
+    file per account. Records are keyed by a hash of the username, and
+    are encrypted with a key derived from the secret. The store needs the
+    optional cryptography package, installed with the crypto extra.
+
+    Changes to a file are made under a lock shared by the threads of this
+    process and, where fcntl is available, a lock file shared with other
+    processes.
+    """
+
+    def __init__(self, path: str, secret: str):
+        """Initialise the token store.
+
+        Args:
+            path (str): File or directory to keep the tokens in.
+            secret (str): Secret to derive the encryption key from.
+        """
+        self.path = path
+        self.secret = secret.encode("utf-8")
+        self.keys = {}
+
+    @property
+    def available(self):
+        """Check if tokens can be encrypted."""
+        return Fernet is not None
+
+    def load(self, username: str):
+        """Load the tokens saved for an account.
+
+        Args:
+            username (str): Hive username.
+
+        Returns:
+            dict: Token data, creation time and expiry, or None if there are none.
+        """
+        if not self.available:
+            return None
+
+        record = self.readRecords(username).get(self.accountKey(username))
+        if record is None:
+            return None
+
+        try:
+            fernet = Fernet(self.deriveKey(record["salt"]))
+            return json.loads(fernet.decrypt(record["tokens"].encode("ascii")))
+        except (InvalidToken, KeyError, TypeError, ValueError):
+            return None
+
+    def save(self, username: str, tokens: dict):
+        """Save the tokens for an account.
+
+        Args:
+            username (str): Hive username.
+            tokens (dict): Token data, creation time and expiry.
+
+        Returns:
+            boolean: True/False if the tokens were saved.
+        """
+        if not self.available:
+            return False
+
+        account = self.accountKey(username)
+        with self.lockRecords(username):
+            records = self.readRecords(username)
+            salt = records.get(account, {}).get("salt") or base64.b64encode(
+                os.urandom(16)
+            ).decode("ascii")
+            fernet = Fernet(self.deriveKey(salt))
+            records[account] = {
+                "salt": salt,
+                "tokens": fernet.encrypt(json.dumps(tokens).encode("utf-8")).decode(
+                    "ascii"
+                ),
+            }
+            return self.writeRecords(username, records)
+
+    def remove(self, username: str):
+        """Remove the tokens saved for an account.
+
+        Args:
+            username (str): Hive username.
+        """
+        with self.lockRecords(username):
+            records = self.readRecords(username)
+            if records.pop(self.accountKey(username), None) is not None:
+                self.writeRecords(username, records)
+
+    @staticmethod
+    def accountKey(username: str):
+        """Get the key a username is stored under."""
+        return hashlib.sha256(username.lower().encode("utf-8")).hexdigest()
+
+    def deriveKey(self, salt: str):
+        """Derive the encryption key for a salt.
+
+        Args:
+            salt (str): Base64 encoded salt.
+
+        Returns:
+            bytes: Key to use with Fernet.
+        """
+        if salt not in self.keys:
+            key = hashlib.pbkdf2_hmac(
+                "sha256", self.secret, base64.b64decode(salt), ITERATIONS
+            )
+            self.keys[salt] = base64.urlsafe_b64encode(key)
+        return self.keys[salt]
+
+    def recordFile(self, username: str):
+        """Get the file that holds the record for an account."""
+        if os.path.isdir(self.path):
+            return os.path.join(self.path, self.accountKey(username) + ".json")
+        return self.path
+
+    @contextlib.contextmanager
+    def lockRecords(self, username: str):
+        """Lock the file for an account while its records are changed."""
+        file = os.path.abspath(self.recordFile(username))
+        with FILE_LOCKS_GUARD:
+            lock = FILE_LOCKS.setdefault(file, threading.Lock())
+
+        with lock:
+            if fcntl is None:
+                yield
+                return
+
+            try:
+                fd = os.open(file + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError:
+                yield
+                return
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def readRecords(self, username: str):
+        """Read the records from the file for an account."""
+        try:
+            with open(self.recordFile(username)) as j:
+                records = json.load(j)
+        except (OSError, ValueError):
+            return {}
+
+        return records if isinstance(records, dict) else {}
+
+    def writeRecords(self, username: str, records: dict):
+        """Write the records to the file for an account atomically."""
+        file = self.recordFile(username)
+        try:
+            fd, temp = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(file)),
+                prefix=os.path.basename(file) + ".",
+                suffix=".tmp",
+            )
+        except OSError:
+            return False
+
+        try:
+            with os.fdopen(fd, "w") as j:
+                json.dump(records, j)
+            os.replace(temp, file)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.remove(temp)
+            return False
+
+        return True
@@ -0,0 +1,83 @@
+"""Hive write buffer module."""
+import asyncio
+import functools
+
+
+class HiveWriteBuffer:
+    """Merge writes sent to the same node within a window into one write."""
+
+    def __init__(self, session: object = None):
+        """Initialise write buffer.
+
+        Args:
+            session (object, optional): Session to interact with hive account. Defaults to None.
+        """
+        self.session = session
+        self.pending = {}
+        self.tasks = set()
+
+    async def add(self, n_type: str, n_id: str, state: dict):
+        """Add state to the pending write for a node.
+
+        Args:
+            n_type (str): Type of the node.
+            n_id (str): ID of the node.
+            state (dict): State values to send.
+
+        Returns:
+            dict: Response from the API for the merged write.
+        """
+        write = self.pending.get(n_id)
+        if write is None:
+            write = {
+                "type": n_type,
+                "state": {},
+                "future": asyncio.get_event_loop().create_future(),
+            }
+            self.pending[n_id] = write
+            task = asyncio.ensure_future(self.flush(n_id))
+            self.tasks.add(task)
+            task.add_done_callback(functools.partial(self.flushDone, n_id, write))
+
+        write["state"].update(state)
+        return await asyncio.shield(write["future"])
+
+    async def flush(self, n_id: str):
+        """Send the pending write for a node once the window has passed.
+
+        Args:
+            n_id (str): ID of the node.
+        """
+        await asyncio.sleep(self.session.config.writeWindow.total_seconds())
+        write = self.pending.pop(n_id)
+
+        try:
+            resp = await self.session.sendState(write["type"], n_id, **write["state"])
+        except Exception as e:
+            write["future"].set_exception(e)
+        else:
+            write["future"].set_result(resp)
+
+    def flushDone(self, n_id: str, write: dict, task: asyncio.Task):
+        """Clean up once the flush for a write has finished.
+
+        If the flush was cancelled, even before it started, the write is
+        removed and the callers waiting for it are cancelled too.
+
+        Args:
+            n_id (str): ID of the node.
+            write (dict): Write the flush was started for.
+            task (asyncio.Task): Task running the flush.
+        """
+        self.tasks.discard(task)
+        if self.pending.get(n_id) is write:
+            del self.pending[n_id]
+        if not write["future"].done():
+            write["future"].cancel()
+
+    async def close(self):
+        """Cancel the writes that have not been sent yet."""
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
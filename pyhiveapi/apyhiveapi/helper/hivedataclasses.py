@@ -1,20 +1,107 @@
 """Device data class."""
 
-from dataclasses import dataclass
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field
+
+DEVICE_KEYS = (
+    "hiveID",
+    "hiveName",
+    "hiveType",
+    "haType",
+    "haName",
+    "deviceData",
+    "status",
+    "attributes",
+    "parentDevice",
+    "isGroup",
+    "device_id",
+    "device_name",
+    "custom",
+)
+DEVICE_SLOTS = frozenset(DEVICE_KEYS)
+
+
+class Device(MutableMapping):
+    """Class for keeping track of an device.
+
+    The device can be used as a dict. Common keys are held in slots and any
+    other keys in a dict that is only created when needed.
+    """
+
+    __slots__ = DEVICE_KEYS + ("extra",)
+
+    def __init__(self, *args, **kwargs):
+        """Initialise device.
+
+        Args:
+            args: Mapping or iterable of key and value pairs.
+            kwargs: Keys and values.
+        """
+        self.extra = None
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        """Get the value of a key."""
+        if key in DEVICE_SLOTS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        """Set the value of a key."""
+        if key in DEVICE_SLOTS:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        """Remove a key."""
+        if key in DEVICE_SLOTS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is None:
+            raise KeyError(key)
+        else:
+            del self.extra[key]
+
+    def __iter__(self):
+        """Iterate over the keys that are set."""
+        for key in DEVICE_KEYS:
+            if hasattr(self, key):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        """Get the number of keys that are set."""
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        """Represent the device as a dict."""
+        return f"Device({dict(self)!r})"
 
 
 @dataclass
-class Device:
-    """Class for keeping track of an device."""
-
-    hiveID: str
-    hiveName: str
-    hiveType: str
-    haType: str
-    deviceData: dict
-    status: dict
-    data: dict
-    parentDevice: str
-    isGroup: bool
-    device_id: str
-    device_name: str
+class HiveChange:
+    """Class for a single value that changed between two polls."""
+
+    path: tuple
+    old: object
+    new: object
+
+
+@dataclass
+class HiveEvent:
+    """Class for the changes made to a node between two polls."""
+
+    deviceID: str
+    nodeType: str
+    changes: list = field(default_factory=list)
@@ -9,6 +9,7 @@ from loguru import logger
 
 from .action import HiveAction
 from .alarm import Alarm
+from .api.hive_pool import HivePool
 from .heating import Climate
 from .hotwater import WaterHeater
 from .hub import HiveHub
@@ -98,6 +99,8 @@ class Hive(HiveSession):
         websession: Optional[ClientSession] = None,
         username: str = None,
         password: str = None,
+        pool: Optional[HivePool] = None,
+        authBackend: str = None,
     ):
         """Generate a Hive session.
 
@@ -105,8 +108,10 @@ class Hive(HiveSession):
             websession (Optional[ClientSession], optional): This is a websession that can be used for the api. Defaults to None.
             username (str, optional): This is the Hive username used for login. Defaults to None.
             password (str, optional): This is the Hive password used for login. Defaults to None.
+            pool (Optional[HivePool], optional): Connection pool to share with other sessions. Defaults to None.
+            authBackend (str, optional): Cognito client for auth, "boto3" or "native". Defaults to boto3 when installed.
         """
-        super().__init__(username, password, websession)
+        super().__init__(username, password, websession, pool, authBackend)
         self.session = self
         self.action = HiveAction(self.session)
         self.alarm = Alarm(self.session)
@@ -1,4 +1,5 @@
 """Hive Hotwater Module."""
+from datetime import datetime
 
 from .helper.const import HIVETOHA
 
@@ -104,7 +105,9 @@ class HiveHotwater:
                 if await self.getBoost(device) == "ON":
                     state = "ON"
                 else:
-                    snan = self.session.helper.getScheduleNNL(data["state"]["schedule"])
+                    snan = self.session.helper.getScheduleNNL(
+                        data["state"]["schedule"], device["hiveID"]
+                    )
                     state = snan["now"]["value"]["status"]
 
             final = HIVETOHA[self.hotwaterType].get(state, state)
@@ -128,12 +131,11 @@ class HiveHotwater:
         if device["hiveID"] in self.session.data.products:
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], mode=new_mode
             )
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -156,12 +158,11 @@ class HiveHotwater:
         ):
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], mode="BOOST", boost=mins
             )
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -184,11 +185,10 @@ class HiveHotwater:
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
             prev_mode = data["props"]["previous"]["mode"]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], mode=prev_mode
             )
             if resp["original"] == 200:
-                await self.session.getDevices(device["hiveID"])
                 final = True
 
         return final
@@ -223,29 +223,19 @@ class WaterHeater(HiveHotwater):
         )
 
         if device["deviceData"]["online"]:
-
-            dev_data = {}
             self.session.helper.deviceRecovered(device["device_id"])
             data = self.session.data.devices[device["device_id"]]
-            dev_data = {
-                "hiveID": device["hiveID"],
-                "hiveName": device["hiveName"],
-                "hiveType": device["hiveType"],
-                "haName": device["haName"],
-                "haType": device["haType"],
-                "device_id": device["device_id"],
-                "device_name": device["device_name"],
-                "status": {"current_operation": await self.getMode(device)},
-                "deviceData": data.get("props", None),
-                "parentDevice": data.get("parent", None),
-                "custom": device.get("custom", None),
-                "attributes": await self.session.attr.stateAttributes(
-                    device["device_id"], device["hiveType"]
-                ),
-            }
-
-            self.session.devices.update({device["hiveID"]: dev_data})
-            return self.session.devices[device["hiveID"]]
+            status = device.setdefault("status", {})
+            status["current_operation"] = await self.getMode(device)
+            device["deviceData"] = data.get("props", None)
+            device["parentDevice"] = data.get("parent", None)
+            device["custom"] = device.get("custom", None)
+            device["attributes"] = await self.session.attr.stateAttributes(
+                device["device_id"], device["hiveType"]
+            )
+
+            self.session.devices[device["hiveID"]] = device
+            return device
         else:
             await self.session.log.errorCheck(
                 device["device_id"], "ERROR", device["deviceData"]["online"]
@@ -267,7 +257,56 @@ class WaterHeater(HiveHotwater):
             mode_current = await self.getMode(device)
             if mode_current == "SCHEDULE":
                 data = self.session.data.products[device["hiveID"]]
-                state = self.session.helper.getScheduleNNL(data["state"]["schedule"])
+                state = self.session.helper.getScheduleNNL(
+                    data["state"]["schedule"], device["hiveID"]
+                )
+        except KeyError as e:
+            await self.session.log.error(e)
+
+        return state
+
+    async def getScheduleTimeline(self, device: dict, start: datetime, end: datetime):
+        """Hive get hotwater schedule as steps between two times.
+
+        Args:
+            device (dict): Device to get schedule for.
+            start (datetime): Start of the time range.
+            end (datetime): End of the time range.
+
+        Returns:
+            list: Steps with their start, end and scheduled value.
+        """
+        state = None
+
+        try:
+            data = self.session.data.products[device["hiveID"]]
+            schedule = self.session.helper.getSchedule(
+                data["state"]["schedule"], device["hiveID"]
+            )
+            state = schedule.timeline(start, end)
+        except KeyError as e:
+            await self.session.log.error(e)
+
+        return state
+
+    async def getScheduleValues(self, device: dict, timestamps: list):
+        """Hive get hotwater scheduled value at each of a list of times.
+
+        Args:
+            device (dict): Device to get schedule for.
+            timestamps (list): Datetimes or epoch times to evaluate.
+
+        Returns:
+            list: Scheduled value at each time.
+        """
+        state = None
+
+        try:
+            data = self.session.data.products[device["hiveID"]]
+            schedule = self.session.helper.getSchedule(
+                data["state"]["schedule"], device["hiveID"]
+            )
+            state = schedule.valuesAt(timestamps)
         except KeyError as e:
             await self.session.log.error(e)
 
@@ -181,13 +181,12 @@ class HiveLight:
         ):
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], status="OFF"
             )
 
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -209,12 +208,11 @@ class HiveLight:
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
 
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"], device["hiveID"], status="ON"
             )
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -236,7 +234,7 @@ class HiveLight:
         ):
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"],
                 device["hiveID"],
                 status="ON",
@@ -244,7 +242,6 @@ class HiveLight:
             )
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -268,13 +265,13 @@ class HiveLight:
             data = self.session.data.products[device["hiveID"]]
 
             if data["type"] == "tuneablelight":
-                resp = await self.session.api.setState(
+                resp = await self.session.setState(
                     data["type"],
                     device["hiveID"],
                     colourTemperature=color_temp,
                 )
             else:
-                resp = await self.session.api.setState(
+                resp = await self.session.setState(
                     data["type"],
                     device["hiveID"],
                     colourMode="WHITE",
@@ -283,7 +280,6 @@ class HiveLight:
 
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -306,7 +302,7 @@ class HiveLight:
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
 
-            resp = await self.session.api.setState(
+            resp = await self.session.setState(
                 data["type"],
                 device["hiveID"],
                 colourMode="COLOUR",
@@ -316,7 +312,6 @@ class HiveLight:
             )
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -348,59 +343,34 @@ class Light(HiveLight):
         device["deviceData"].update(
             {"online": await self.session.attr.onlineOffline(device["device_id"])}
         )
-        dev_data = {}
 
         if device["deviceData"]["online"]:
             self.session.helper.deviceRecovered(device["device_id"])
             data = self.session.data.devices[device["device_id"]]
-            dev_data = {
-                "hiveID": device["hiveID"],
-                "hiveName": device["hiveName"],
-                "hiveType": device["hiveType"],
-                "haName": device["haName"],
-                "haType": device["haType"],
-                "device_id": device["device_id"],
-                "device_name": device["device_name"],
-                "status": {
-                    "state": await self.getState(device),
-                    "brightness": await self.getBrightness(device),
-                },
-                "deviceData": data.get("props", None),
-                "parentDevice": data.get("parent", None),
-                "custom": device.get("custom", None),
-                "attributes": await self.session.attr.stateAttributes(
-                    device["device_id"], device["hiveType"]
-                ),
-            }
+            status = device.setdefault("status", {})
+            status["state"] = await self.getState(device)
+            status["brightness"] = await self.getBrightness(device)
+            device["deviceData"] = data.get("props", None)
+            device["parentDevice"] = data.get("parent", None)
+            device["custom"] = device.get("custom", None)
+            device["attributes"] = await self.session.attr.stateAttributes(
+                device["device_id"], device["hiveType"]
+            )
 
             if device["hiveType"] in ("tuneablelight", "colourtuneablelight"):
-                dev_data.update(
-                    {
-                        "min_mireds": await self.getMinColorTemp(device),
-                        "max_mireds": await self.getMaxColorTemp(device),
-                    }
-                )
-                dev_data["status"].update(
-                    {"color_temp": await self.getColorTemp(device)}
-                )
+                device["min_mireds"] = await self.getMinColorTemp(device)
+                device["max_mireds"] = await self.getMaxColorTemp(device)
+                status["color_temp"] = await self.getColorTemp(device)
             if device["hiveType"] == "colourtuneablelight":
                 mode = await self.getColorMode(device)
                 if mode == "COLOUR":
-                    dev_data["status"].update(
-                        {
-                            "hs_color": await self.getColor(device),
-                            "mode": await self.getColorMode(device),
-                        }
-                    )
+                    status["hs_color"] = await self.getColor(device)
                 else:
-                    dev_data["status"].update(
-                        {
-                            "mode": await self.getColorMode(device),
-                        }
-                    )
-
-            self.session.devices.update({device["hiveID"]: dev_data})
-            return self.session.devices[device["hiveID"]]
+                    status.pop("hs_color", None)
+                status["mode"] = mode
+
+            self.session.devices[device["hiveID"]] = device
+            return device
         else:
             await self.session.log.errorCheck(
                 device["device_id"], "ERROR", device["deviceData"]["online"]
@@ -68,12 +68,9 @@ class HiveSmartPlug:
         ):
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
-                data["type"], data["id"], status="ON"
-            )
+            resp = await self.session.setState(data["type"], data["id"], status="ON")
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -94,12 +91,9 @@ class HiveSmartPlug:
         ):
             await self.session.hiveRefreshTokens()
             data = self.session.data.products[device["hiveID"]]
-            resp = await self.session.api.setState(
-                data["type"], data["id"], status="OFF"
-            )
+            resp = await self.session.setState(data["type"], data["id"], status="OFF")
             if resp["original"] == 200:
                 final = True
-                await self.session.getDevices(device["hiveID"])
 
         return final
 
@@ -131,43 +125,25 @@ class Switch(HiveSmartPlug):
         device["deviceData"].update(
             {"online": await self.session.attr.onlineOffline(device["device_id"])}
         )
-        dev_data = {}
 
         if device["deviceData"]["online"]:
             self.session.helper.deviceRecovered(device["device_id"])
             data = self.session.data.devices[device["device_id"]]
-            dev_data = {
-                "hiveID": device["hiveID"],
-                "hiveName": device["hiveName"],
-                "hiveType": device["hiveType"],
-                "haName": device["haName"],
-                "haType": device["haType"],
-                "device_id": device["device_id"],
-                "device_name": device["device_name"],
-                "status": {
-                    "state": await self.getSwitchState(device),
-                },
-                "deviceData": data.get("props", None),
-                "parentDevice": data.get("parent", None),
-                "custom": device.get("custom", None),
-                "attributes": {},
-            }
+            status = device.setdefault("status", {})
+            status["state"] = await self.getSwitchState(device)
+            device["deviceData"] = data.get("props", None)
+            device["parentDevice"] = data.get("parent", None)
+            device["custom"] = device.get("custom", None)
+            device["attributes"] = {}
 
             if device["hiveType"] == "activeplug":
-                dev_data.update(
-                    {
-                        "status": {
-                            "state": dev_data["status"]["state"],
-                            "power_usage": await self.getPowerUsage(device),
-                        },
-                        "attributes": await self.session.attr.stateAttributes(
-                            device["device_id"], device["hiveType"]
-                        ),
-                    }
+                status["power_usage"] = await self.getPowerUsage(device)
+                device["attributes"] = await self.session.attr.stateAttributes(
+                    device["device_id"], device["hiveType"]
                 )
 
-            self.session.devices.update({device["hiveID"]: dev_data})
-            return self.session.devices[device["hiveID"]]
+            self.session.devices[device["hiveID"]] = device
+            return device
         else:
             await self.session.log.errorCheck(
                 device["device_id"], "ERROR", device["deviceData"]["online"]
@@ -68,6 +68,21 @@ class Sensor(HiveSensor):
             session (object, optional): session to interact with Hive account. Defaults to None.
         """
         self.session = session
+        self.commands = None
+
+    def getCommands(self):
+        """Get the getter to call for each sensor type.
+
+        Returns:
+            dict: Bound getter and device key for each sensor type.
+        """
+        if self.commands is None:
+            self.commands = {
+                hiveType: (getattr(getattr(self.session, module), method), key)
+                for hiveType, (module, method, key) in sensor_commands.items()
+            }
+
+        return self.commands
 
     async def getSensor(self, device: dict):
         """Gets updated sensor data.
@@ -90,54 +105,36 @@ class Sensor(HiveSensor):
             if device["hiveType"] not in ("Availability", "Connectivity"):
                 self.session.helper.deviceRecovered(device["device_id"])
 
-            dev_data = {}
-            dev_data = {
-                "hiveID": device["hiveID"],
-                "hiveName": device["hiveName"],
-                "hiveType": device["hiveType"],
-                "haName": device["haName"],
-                "haType": device["haType"],
-                "device_id": device.get("device_id", None),
-                "device_name": device.get("device_name", None),
-                "deviceData": {},
-                "custom": device.get("custom", None),
-            }
+            device["device_name"] = device.get("device_name", None)
+            device["custom"] = device.get("custom", None)
 
             if device["device_id"] in self.session.data.devices:
                 data = self.session.data.devices.get(device["device_id"], {})
             elif device["hiveID"] in self.session.data.products:
                 data = self.session.data.products.get(device["hiveID"], {})
 
-            if (
-                dev_data["hiveType"] in sensor_commands
-                or dev_data.get("custom", None) in sensor_commands
-            ):
-                code = sensor_commands.get(
-                    dev_data["hiveType"],
-                    sensor_commands.get(dev_data["custom"]),
-                )
-                dev_data.update(
-                    {
-                        "status": {"state": await eval(code)},
-                        "deviceData": data.get("props", None),
-                        "parentDevice": data.get("parent", None),
-                    }
-                )
+            commands = self.getCommands()
+            command = commands.get(device["hiveType"], commands.get(device["custom"]))
+            if command is not None:
+                getter, key = command
+                status = device.setdefault("status", {})
+                status["state"] = await getter(device if key is None else device[key])
+                device["deviceData"] = data.get("props", None)
+                device["parentDevice"] = data.get("parent", None)
             elif device["hiveType"] in HIVE_TYPES["Sensor"]:
                 data = self.session.data.devices.get(device["hiveID"], {})
-                dev_data.update(
-                    {
-                        "status": {"state": await self.getState(device)},
-                        "deviceData": data.get("props", None),
-                        "parentDevice": data.get("parent", None),
-                        "attributes": await self.session.attr.stateAttributes(
-                            device["device_id"], device["hiveType"]
-                        ),
-                    }
+                status = device.setdefault("status", {})
+                status["state"] = await self.getState(device)
+                device["deviceData"] = data.get("props", None)
+                device["parentDevice"] = data.get("parent", None)
+                device["attributes"] = await self.session.attr.stateAttributes(
+                    device["device_id"], device["hiveType"]
                 )
+            else:
+                device["deviceData"] = {}
 
-            self.session.devices.update({device["hiveID"]: dev_data})
-            return self.session.devices[device["hiveID"]]
+            self.session.devices[device["hiveID"]] = device
+            return device
         else:
             await self.session.log.errorCheck(
                 device["device_id"], "ERROR", device["deviceData"]["online"]
@@ -1,9 +1,10 @@
 """Hive Session Module."""
 import asyncio
-import copy
+import contextvars
 import json
 import operator
 import os
+import random
 import time
 import traceback
 from datetime import datetime, timedelta
@@ -12,16 +13,29 @@ from aiohttp.web import HTTPException
 from apyhiveapi import API, Auth
 
 from .device_attributes import HiveAttributes
-from .helper.const import ACTIONS, DEVICES, HIVE_TYPES, PRODUCTS
+from .helper.const import HIVE_TYPES
+from .helper.hive_events import HiveEvents
 from .helper.hive_exceptions import (
     HiveApiError,
+    HiveCircuitOpen,
     HiveReauthRequired,
     HiveUnknownConfiguration,
 )
+from .helper.hive_factory import ACTION_ENTITIES, DEVICE_ENTITIES, PRODUCT_ENTITIES
 from .helper.hive_helper import HiveHelper
+from .helper.hive_history import HiveTemperatureHistory
+from .helper.hive_login_cache import LOGIN_CACHE
+from .helper.hive_token_store import HiveTokenStore
+from .helper.hive_write_buffer import HiveWriteBuffer
+from .helper.hivedataclasses import Device
 from .helper.logger import Logger
 from .helper.map import Map
 
+batching = contextvars.ContextVar("batching", default=False)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_CONFIG = ("alarm", "battery", "homeID", "mode", "userID", "username")
+
 
 class HiveSession:
     """Hive Session Code.
@@ -39,7 +53,12 @@ class HiveSession:
     sessionType = "Session"
 
     def __init__(
-        self, username: str = None, password: str = None, websession: object = None
+        self,
+        username: str = None,
+        password: str = None,
+        websession: object = None,
+        pool: object = None,
+        authBackend: str = None,
     ):
         """Initialise the base variable values.
 
@@ -47,16 +66,31 @@ class HiveSession:
             username (str, optional): Hive username. Defaults to None.
             password (str, optional): Hive Password. Defaults to None.
             websession (object, optional): Websession for api calls. Defaults to None.
+            pool (object, optional): Connection pool shared with other sessions. Defaults to None.
+            authBackend (str, optional): Cognito client for auth, "boto3" or "native". Defaults to boto3 when installed.
         """
         self.auth = None
-        self.api = API(hiveSession=self, websession=websession)
+        self.api = API(hiveSession=self, websession=websession, pool=pool)
         if None not in (username, password):
-            self.auth = Auth(username=username, password=password)
+            self.auth = Auth(
+                username=username,
+                password=password,
+                websession=self.api.websession,
+                backend=authBackend,
+            )
 
         self.helper = HiveHelper(self)
         self.attr = HiveAttributes(self)
         self.log = Logger(self)
+        self.events = HiveEvents(self)
+        self.writes = HiveWriteBuffer(self)
         self.updateLock = asyncio.Lock()
+        self.refreshTask = None
+        self.refreshSent = False
+        self.startupTask = None
+        self.tokenTask = None
+        self.tokenRefresh = None
+        self.tokenStore = None
         self.tokens = Map(
             {
                 "tokenData": {},
@@ -71,12 +105,30 @@ class HiveSession:
                 "errorList": {},
                 "file": False,
                 "homeID": None,
-                "lastUpdated": datetime.now(),
+                "lastUpdate": datetime.now(),
+                "longLived": False,
+                "longLivedLifetime": timedelta(days=7),
+                "longLivedMargin": timedelta(hours=12),
+                "longLivedRetry": timedelta(minutes=15),
                 "mode": [],
+                "optimistic": False,
+                "refreshWindow": timedelta(seconds=0),
                 "scanInterval": timedelta(seconds=120),
                 "sensors": False,
+                "snapshotFile": None,
+                "snapshotInterval": timedelta(minutes=10),
+                "lastSnapshot": None,
+                "stale": False,
+                "tokenRefreshJitter": timedelta(seconds=60),
+                "tokenRefreshMargin": timedelta(minutes=5),
+                "tokenRefreshRetry": timedelta(seconds=30),
+                "temperatureHistory": {
+                    "size": 1440,
+                    "windows": {"hour": 3600, "day": 86400},
+                },
                 "userID": None,
                 "username": username,
+                "writeWindow": timedelta(seconds=0),
             }
         )
         self.data = Map(
@@ -85,12 +137,42 @@ class HiveSession:
                 "devices": {},
                 "actions": {},
                 "user": {},
-                "minMax": {},
                 "alarm": {},
             }
         )
         self.devices = {}
         self.deviceList = {}
+        self.history = {}
+        self.zones = {}
+
+    async def __aenter__(self):
+        """Use the session as an async context manager."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Close the session when leaving the context."""
+        await self.close()
+
+    async def close(self):
+        """Stop background tasks, save the snapshot and close the websession."""
+        tasks = [
+            task
+            for task in (self.tokenTask, self.startupTask, self.refreshTask)
+            if task is not None and not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.writes.close()
+        await self.events.close()
+
+        if self.config.snapshotFile and not self.config.file:
+            try:
+                await self.saveSnapshot()
+            except (OSError, TypeError, ValueError) as e:
+                await self.log.error(e)
+
+        await self.api.close()
 
     def openFile(self, file: str):
         """Open a file.
@@ -108,6 +190,153 @@ class HiveSession:
 
         return data
 
+    def saveHistory(self, file: str):
+        """Save the temperature history of each heating product.
+
+        Args:
+            file (str): File location.
+        """
+        data = {n_id: history.toDict() for n_id, history in self.history.items()}
+        temp = file + ".tmp"
+        with open(temp, "w") as j:
+            json.dump(data, j)
+        os.replace(temp, file)
+
+    def loadHistory(self, file: str):
+        """Load temperature history saved with saveHistory.
+
+        Args:
+            file (str): File location.
+
+        Returns:
+            boolean: True/False if the history was loaded.
+        """
+        try:
+            with open(file) as j:
+                data = json.load(j)
+        except (OSError, ValueError):
+            return False
+
+        self.history.update(
+            {
+                n_id: HiveTemperatureHistory.fromDict(history)
+                for n_id, history in data.items()
+            }
+        )
+        return True
+
+    async def saveSnapshot(self, file: str = None):
+        """Save the session data so the next start can use it straight away.
+
+        The data is serialised on the event loop, so it cannot change while
+        it is saved, and only the file is written in the executor.
+
+        Args:
+            file (str, optional): File location. Defaults to the snapshot file in config.
+
+        Raises:
+            OSError: The snapshot file could not be written.
+            TypeError: The session data could not be serialised.
+            ValueError: The session data could not be serialised.
+
+        Returns:
+            boolean: True if the snapshot was saved, False if there was nothing to save.
+        """
+        file = file or self.config.snapshotFile
+        if file is None or not self.data.products:
+            return False
+
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "created": datetime.now().timestamp(),
+            "config": {key: self.config[key] for key in SNAPSHOT_CONFIG},
+            "data": self.data,
+            "deviceList": {
+                entity_type: [dict(device) for device in devices]
+                for entity_type, devices in self.deviceList.items()
+            },
+            "history": {
+                n_id: history.toDict() for n_id, history in self.history.items()
+            },
+        }
+        text = json.dumps(snapshot, separators=(",", ":"))
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.writeSnapshot, file, text)
+
+        self.config.lastSnapshot = datetime.now()
+        return True
+
+    @staticmethod
+    def writeSnapshot(file: str, text: str):
+        """Write a snapshot to a file, replacing it in one step.
+
+        Args:
+            file (str): File location.
+            text (str): Serialised snapshot to write.
+        """
+        temp = file + ".tmp"
+        with open(temp, "w") as j:
+            j.write(text)
+        os.replace(temp, file)
+
+    @staticmethod
+    def readSnapshot(file: str):
+        """Read a snapshot from a file.
+
+        Args:
+            file (str): File location.
+
+        Returns:
+            dict: Snapshot read from the file.
+        """
+        with open(file) as j:
+            return json.load(j)
+
+    async def loadSnapshot(self, file: str = None):
+        """Load session data saved with saveSnapshot.
+
+        The loaded data is marked as stale until the next successful update,
+        and the last update time is set to when the snapshot was created.
+
+        Args:
+            file (str, optional): File location. Defaults to the snapshot file in config.
+
+        Returns:
+            boolean: True/False if the snapshot was loaded.
+        """
+        file = file or self.config.snapshotFile
+        if file is None:
+            return False
+
+        loop = asyncio.get_running_loop()
+        try:
+            snapshot = await loop.run_in_executor(None, self.readSnapshot, file)
+            if snapshot["version"] != SNAPSHOT_VERSION:
+                return False
+            if snapshot["config"]["username"] != self.config.username:
+                return False
+
+            for key in ("products", "devices", "actions", "user", "alarm"):
+                self.data[key] = snapshot["data"].get(key, {})
+            self.config.update(snapshot["config"])
+            self.deviceList = {
+                entity_type: [Device(device) for device in devices]
+                for entity_type, devices in snapshot["deviceList"].items()
+            }
+            self.history.update(
+                {
+                    n_id: HiveTemperatureHistory.fromDict(history)
+                    for n_id, history in snapshot.get("history", {}).items()
+                }
+            )
+        except (OSError, KeyError, TypeError, ValueError):
+            return False
+
+        self.helper.updateZones(self.data.devices, list(self.data.devices), set())
+        self.config.lastUpdate = datetime.fromtimestamp(snapshot.get("created", 0))
+        self.config.stale = True
+        return True
+
     def addList(self, type: str, data: dict, **kwargs: dict):
         """Add entity to the list.
 
@@ -125,21 +354,21 @@ class HiveSession:
             if device["state"]["name"] != "Receiver"
             else "Heating"
         )
-        formatted_data = {}
+        formatted_data = Device()
 
         if add:
             try:
-                formatted_data = {
-                    "hiveID": data.get("id", ""),
-                    "hiveName": device_name,
-                    "hiveType": data.get("type", ""),
-                    "haType": type,
-                    "deviceData": device.get("props", data.get("props", {})),
-                    "parentDevice": data.get("parent", None),
-                    "isGroup": data.get("isGroup", False),
-                    "device_id": device["id"],
-                    "device_name": device_name,
-                }
+                formatted_data.update(
+                    hiveID=data.get("id", ""),
+                    hiveName=device_name,
+                    hiveType=data.get("type", ""),
+                    haType=type,
+                    deviceData=device.get("props", data.get("props", {})),
+                    parentDevice=data.get("parent", None),
+                    isGroup=data.get("isGroup", False),
+                    device_id=device["id"],
+                    device_name=device_name,
+                )
 
                 if kwargs.get("haName", "FALSE")[0] == " ":
                     kwargs["haName"] = device_name + kwargs["haName"]
@@ -200,9 +429,58 @@ class HiveSession:
 
         if "ExpiresIn" in data:
             self.tokens.tokenExpiry = timedelta(seconds=data["ExpiresIn"])
+            self.tokens.tokenCreated = datetime.now()
+
+        claims = self.helper.getTokenClaims(self.tokens.tokenData.get("accessToken"))
+        if "iat" in claims and "exp" in claims:
+            self.tokens.tokenCreated = datetime.fromtimestamp(claims["iat"])
+            self.tokens.tokenExpiry = timedelta(seconds=claims["exp"] - claims["iat"])
+
+        if self.tokenStore is not None:
+            await self.saveTokens()
 
         return self.tokens
 
+    async def loadTokens(self):
+        """Load tokens for the account from the token store.
+
+        Returns:
+            boolean: True/False if tokens were loaded.
+        """
+        if self.tokenStore is None:
+            return False
+
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(
+            None, self.tokenStore.load, self.config.username
+        )
+        if not data or "refreshToken" not in data.get("tokenData", {}):
+            return False
+
+        self.tokens.tokenData.update(data["tokenData"])
+        self.tokens.tokenCreated = datetime.fromtimestamp(data["tokenCreated"])
+        self.tokens.tokenExpiry = timedelta(seconds=data["tokenExpiry"])
+        return True
+
+    async def saveTokens(self):
+        """Save the tokens for the account to the token store.
+
+        Returns:
+            boolean: True/False if the tokens were saved.
+        """
+        if self.tokenStore is None or "refreshToken" not in self.tokens.tokenData:
+            return False
+
+        data = {
+            "tokenData": dict(self.tokens.tokenData),
+            "tokenCreated": self.tokens.tokenCreated.timestamp(),
+            "tokenExpiry": self.tokens.tokenExpiry.total_seconds(),
+        }
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self.tokenStore.save, self.config.username, data
+        )
+
     async def login(self):
         """Login to hive account.
 
@@ -215,7 +493,7 @@ class HiveSession:
         if not self.auth:
             raise HiveUnknownConfiguration
 
-        result = self.auth.login()
+        result = await self.auth.login()
         await self.updateTokens(result)
         return result
 
@@ -229,31 +507,288 @@ class HiveSession:
         Returns:
             dict: result of the login request.
         """
-        result = self.auth.sms_2fa(code, session)
+        result = await self.auth.sms_2fa(code, session)
         await self.updateTokens(result)
         return result
 
-    async def hiveRefreshTokens(self):
+    async def hiveRefreshTokens(self, force: bool = False):
         """Refresh Hive tokens.
 
+        Tokens are refreshed ahead of expiry by a background task, so this
+        only refreshes inline when the token has already expired. Callers
+        that arrive while a refresh is running wait for the same refresh.
+        Nothing is refreshed while a long lived token is in use.
+
+        Args:
+            force (bool, optional): Refresh even if the token has not expired. Defaults to False.
+
         Returns:
-            boolean: True/False if update was successful
+            dict: Result of the refresh, or None if no refresh was needed.
         """
-        result = None
-
         if self.config.file:
             return None
-        else:
-            expiry_time = self.tokens.tokenCreated + self.tokens.tokenExpiry
-            if datetime.now() >= expiry_time:
-                result = await self.auth.refreshToken(
-                    self.tokens.tokenData["refreshToken"]
-                )
-                self.updateTokens(result[0])
-                self.tokens.tokenCreated = datetime.now()
 
+        self.startTokenRefresher()
+        if not force and self.longLivedActive():
+            return None
+
+        expiry_time = self.tokens.tokenCreated + self.tokens.tokenExpiry
+        if not force and datetime.now() < expiry_time:
+            return None
+
+        if self.tokenRefresh is None or self.tokenRefresh.done():
+            self.tokenRefresh = asyncio.ensure_future(self.refreshTokens())
+        return await asyncio.shield(self.tokenRefresh)
+
+    async def refreshTokens(self):
+        """Request new tokens using the refresh token.
+
+        If the refresh token has expired or been revoked it is dropped, so
+        later refreshes fail straight away until there is a new login.
+
+        Raises:
+            HiveReauthRequired: Tokens have expired and reauthentication is required.
+
+        Returns:
+            dict: Result of the refresh request.
+        """
+        refresh_token = self.tokens.tokenData.get("refreshToken")
+        if refresh_token is None:
+            raise HiveReauthRequired
+
+        try:
+            result = await self.auth.refreshToken(refresh_token)
+        except HiveReauthRequired:
+            self.tokens.tokenData.pop("refreshToken", None)
+            raise
+        await self.updateTokens(result)
+        self.tokens.tokenCreated = datetime.now()
         return result
 
+    def startTokenRefresher(self):
+        """Start the background task that refreshes tokens before they expire."""
+        if self.tokenTask is not None and not self.tokenTask.done():
+            return
+        if self.auth is None or "refreshToken" not in self.tokens.tokenData:
+            return
+
+        self.tokenTask = asyncio.ensure_future(self.tokenRefresher())
+
+    async def tokenRefresher(self):
+        """Refresh tokens ahead of expiry until cancelled.
+
+        In long lived mode the long lived token is renewed instead, and the
+        Cognito tokens are only refreshed if renewing it fails. Refreshing
+        stops once reauthentication is required.
+        """
+        while True:
+            created = self.tokens.tokenCreated
+            renewed = self.tokens.tokenData.get("longLivedExpiry")
+            if self.config.longLived:
+                refresh_time = (
+                    datetime.fromtimestamp(renewed or 0) - self.config.longLivedMargin
+                )
+            else:
+                refresh_time = (
+                    created + self.tokens.tokenExpiry - self.config.tokenRefreshMargin
+                )
+            refresh_time -= self.config.tokenRefreshJitter * random.random()
+            delay = (refresh_time - datetime.now()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                if self.tokens.tokenCreated != created or renewed != (
+                    self.tokens.tokenData.get("longLivedExpiry")
+                ):
+                    continue
+
+            try:
+                if self.config.longLived:
+                    await self.renewLongLivedToken()
+                else:
+                    await self.hiveRefreshTokens(force=True)
+            except asyncio.CancelledError:
+                raise
+            except HiveReauthRequired as e:
+                await self.log.error(e)
+                return
+            except Exception as e:
+                await self.log.error(e)
+                if not self.config.longLived:
+                    await asyncio.sleep(self.config.tokenRefreshRetry.total_seconds())
+                    continue
+
+                if not self.longLivedActive():
+                    try:
+                        await self.hiveRefreshTokens(force=True)
+                    except HiveReauthRequired as e:
+                        await self.log.error(e)
+                        return
+                    except Exception as e:
+                        await self.log.error(e)
+                await asyncio.sleep(self.config.longLivedRetry.total_seconds())
+
+    def longLivedActive(self):
+        """Check if a long lived token is being used for requests.
+
+        Returns:
+            boolean: True if long lived mode is on and the token has not expired.
+        """
+        data = self.tokens.tokenData
+        return (
+            self.config.longLived
+            and "longLivedToken" in data
+            and data.get("longLivedExpiry", 0) > time.time()
+        )
+
+    def getAuthToken(self):
+        """Get the token to authorise API requests with.
+
+        Raises:
+            KeyError: There is no token.
+
+        Returns:
+            str: Long lived token if one is in use, otherwise the Cognito token.
+        """
+        if self.longLivedActive():
+            return self.tokens.tokenData["longLivedToken"]
+        return self.tokens.tokenData["token"]
+
+    async def renewLongLivedToken(self):
+        """Get a new long lived token using the Cognito token.
+
+        Raises:
+            HiveApiError: No long lived token was returned.
+
+        Returns:
+            str: The long lived token.
+        """
+        expiry_time = self.tokens.tokenCreated + self.tokens.tokenExpiry
+        if datetime.now() >= expiry_time:
+            await self.hiveRefreshTokens(force=True)
+
+        resp = await self.api.getLongLivedToken()
+        if operator.contains(str(resp["original"]), "20") is False:
+            raise HiveApiError
+
+        token, expiry = self.helper.getLongLivedToken(resp["parsed"])
+        if token is None:
+            raise HiveApiError
+
+        if expiry is None:
+            expiry = datetime.now() + self.config.longLivedLifetime
+        self.tokens.tokenData.update(
+            {"longLivedToken": token, "longLivedExpiry": expiry.timestamp()}
+        )
+        if self.tokenStore is not None:
+            await self.saveTokens()
+        return token
+
+    async def setState(self, n_type: str, n_id: str, **kwargs):
+        """Set the state of a node.
+
+        When a write window is configured, state sent to the same node within
+        the window is merged and sent as one write whose response is shared
+        by every caller.
+
+        Args:
+            n_type (str): Type of the node.
+            n_id (str): ID of the node.
+
+        Returns:
+            dict: Response from the API.
+        """
+        if self.config.writeWindow.total_seconds() > 0:
+            return await self.writes.add(n_type, n_id, kwargs)
+
+        return await self.sendState(n_type, n_id, **kwargs)
+
+    async def sendState(self, n_type: str, n_id: str, **kwargs):
+        """Send the state of a node and update the session data.
+
+        When optimistic updates are enabled the values that were sent are
+        applied to the session data and reconciled on the next poll,
+        otherwise the nodes are refreshed from the API.
+
+        Args:
+            n_type (str): Type of the node.
+            n_id (str): ID of the node.
+
+        Returns:
+            dict: Response from the API.
+        """
+        resp = await self.api.setState(n_type, n_id, **kwargs)
+
+        if resp["original"] == 200:
+            if self.config.optimistic:
+                self.helper.applyState(n_id, kwargs)
+            elif not batching.get():
+                await self.getDevices(n_id)
+
+        return resp
+
+    async def sendAction(self, n_id: str, data: dict):
+        """Send the state of an action and update the session data.
+
+        The action data is updated in place before it is sent, so the nodes
+        are only refreshed from the API when optimistic updates are off.
+
+        Args:
+            n_id (str): ID of the action.
+            data (dict): Action data to send.
+
+        Returns:
+            dict: Response from the API.
+        """
+        resp = await self.api.setAction(n_id, data)
+
+        if resp["original"] == 200:
+            if not self.config.optimistic and not batching.get():
+                await self.getDevices(n_id)
+
+        return resp
+
+    async def apply(self, commands: list, limit: int = 5):
+        """Apply a list of commands with one refresh at the end.
+
+        Each command is a tuple of a coroutine function followed by its
+        arguments, the first of which is the device, for example
+        (session.light.turnOff, device). Commands for the same device run
+        in order and commands for different devices run concurrently.
+
+        Args:
+            commands (list): Commands to apply.
+            limit (int, optional): Maximum commands to run at once. Defaults to 5.
+
+        Returns:
+            list: Result or exception of each command in order.
+        """
+        semaphore = asyncio.Semaphore(limit)
+        results = [None] * len(commands)
+        queues = {}
+        for index, command in enumerate(commands):
+            device = command[1] if len(command) > 1 else {}
+            queues.setdefault(device.get("hiveID"), []).append(index)
+
+        async def run(indexes):
+            for index in indexes:
+                func, *args = commands[index]
+                async with semaphore:
+                    try:
+                        results[index] = await func(*args)
+                    except Exception as e:
+                        results[index] = e
+
+        token = batching.set(True)
+        try:
+            await asyncio.gather(*(run(indexes) for indexes in queues.values()))
+        finally:
+            batching.reset(token)
+
+        if not self.config.optimistic:
+            await self.getDevices("No_ID")
+
+        return results
+
     async def updateData(self, device: dict):
         """Get latest data for Hive nodes - rate limiting.
 
@@ -275,6 +810,71 @@ class HiveSession:
 
         return updated
 
+    def getBreakerState(self):
+        """Get the state of the circuit breaker for each API endpoint.
+
+        Returns:
+            dict: State, failures in a row and seconds until a trial request by endpoint.
+        """
+        breakers = getattr(self.api, "breakers", {})
+        return {endpoint: breaker.status() for endpoint, breaker in breakers.items()}
+
+    def mergeNodes(self, nodeType: str, current: dict, latest: dict):
+        """Merge the latest nodes into the current nodes.
+
+        Nodes that have not changed since the last poll keep their existing
+        object so only changed nodes are replaced. Changed nodes are
+        published as events when anything is listening and the zone index
+        is updated for changed devices.
+
+        Args:
+            nodeType (str): products, devices or actions.
+            current (dict): Nodes currently held by the session.
+            latest (dict): Nodes returned by the latest API call.
+
+        Returns:
+            dict: Merged nodes.
+        """
+        publish = self.events.active
+        changed = []
+        for n_id, node in latest.items():
+            previous = current.get(n_id)
+            if previous is not None and previous == node:
+                latest[n_id] = previous
+            else:
+                changed.append(n_id)
+                if publish:
+                    self.events.publish(nodeType, n_id, previous, node)
+
+        removed = current.keys() - latest.keys()
+        if publish:
+            for n_id in removed:
+                self.events.publish(nodeType, n_id, current[n_id], None)
+
+        if nodeType == "devices":
+            self.helper.updateZones(latest, changed, removed)
+
+        return latest
+
+    def watch(self):
+        """Watch for changes to the Hive nodes on each poll.
+
+        Returns:
+            object: Async iterator of change events.
+        """
+        return self.events.watch()
+
+    def addListener(self, callback: callable):
+        """Call a function for each change to the Hive nodes on each poll.
+
+        Args:
+            callback (callable): Function or coroutine function taking an event.
+
+        Returns:
+            callable: Function to remove the listener again.
+        """
+        return self.events.addListener(callback)
+
     async def getAlarm(self):
         """Get alarm data.
 
@@ -296,12 +896,60 @@ class HiveSession:
     async def getDevices(self, n_id: str):
         """Get latest data for Hive nodes.
 
+        Callers that ask for a refresh before the current one has been sent
+        share it. Callers that ask once it has been sent share a single
+        follow up refresh, so a burst of requests costs at most two calls.
+
+        Args:
+            n_id (str): ID of the device requesting data.
+
+        Returns:
+            boolean: True/False if update was successful.
+        """
+        if self.refreshTask is None or self.refreshTask.done():
+            self.refreshSent = False
+            self.refreshTask = asyncio.ensure_future(self.refreshDevices(n_id))
+        elif self.refreshSent:
+            self.refreshSent = False
+            self.refreshTask = asyncio.ensure_future(
+                self.refreshDevices(n_id, self.refreshTask)
+            )
+
+        return await asyncio.shield(self.refreshTask)
+
+    async def refreshDevices(self, n_id: str, previous: asyncio.Future = None):
+        """Run a single shared refresh of the Hive nodes.
+
+        Args:
+            n_id (str): ID of the device requesting data.
+            previous (asyncio.Future, optional): Refresh to wait for first. Defaults to None.
+
+        Returns:
+            boolean: True/False if update was successful.
+        """
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        window = self.config.refreshWindow.total_seconds()
+        if window > 0:
+            await asyncio.sleep(window)
+
+        self.refreshSent = True
+        return await self.fetchDevices(n_id)
+
+    async def fetchDevices(self, n_id: str):
+        """Fetch latest data for Hive nodes from the API.
+
+        While the circuit breaker for the API is open the last good data is
+        kept and marked as stale.
+
         Args:
             n_id (str): ID of the device requesting data.
 
         Raises:
             HTTPException: HTTP error has occurred updating the devices.
             HiveApiError: An API error code has been returned.
+            HiveReauthRequired: Tokens have expired and reauthentication is required.
 
         Returns:
             boolean: True/False if update was successful.
@@ -344,14 +992,35 @@ class HiveSession:
                     self.config.homeID = api_resp_p[hiveType]["homes"][0]["id"]
 
             if len(tmpProducts) > 0:
-                self.data.products = copy.deepcopy(tmpProducts)
+                self.data.products = self.mergeNodes(
+                    "products", self.data.products, tmpProducts
+                )
             if len(tmpDevices) > 0:
-                self.data.devices = copy.deepcopy(tmpDevices)
-            self.data.actions = copy.deepcopy(tmpActions)
+                self.data.devices = self.mergeNodes(
+                    "devices", self.data.devices, tmpDevices
+                )
+            self.data.actions = self.mergeNodes(
+                "actions", self.data.actions, tmpActions
+            )
+            self.helper.recordTemperatures()
             if self.config.alarm:
                 await self.getAlarm()
             self.config.lastUpdate = datetime.now()
+            self.config.stale = False
             get_nodes_successful = True
+            if self.config.snapshotFile and not self.config.file:
+                last = self.config.lastSnapshot
+                if (
+                    last is None
+                    or datetime.now() - last >= self.config.snapshotInterval
+                ):
+                    try:
+                        await self.saveSnapshot()
+                    except (OSError, TypeError, ValueError) as e:
+                        await self.log.error(e)
+        except HiveCircuitOpen:
+            self.config.stale = True
+            get_nodes_successful = False
         except (OSError, RuntimeError, HiveApiError, ConnectionError, HTTPException):
             get_nodes_successful = False
 
@@ -360,12 +1029,21 @@ class HiveSession:
     async def startSession(self, config: dict = {}):
         """Setup the Hive platform.
 
+        A snapshot file can be given in the config to build the devices from
+        the last saved data while the latest data is fetched in the background.
+        If no tokens are given, they are loaded from the tokenStore file or
+        directory, and a login is done if none are saved. Set longLived to
+        use a long lived access token for requests, and loginCache to a file
+        to keep the login properties between restarts.
+
         Args:
             config (dict, optional): Configuration for Home Assistant to use. Defaults to {}.
 
         Raises:
             HiveUnknownConfiguration: Unknown configuration identifed.
-            HiveReauthRequired: Tokens have expired and reauthentication is required.
+            HiveReauthRequired: Tokens have expired and reauthentication is required,
+                or the login needs a challenge such as SMS 2FA, in which case the
+                login result is the first argument.
 
         Returns:
             list: List of devices
@@ -381,11 +1059,32 @@ class HiveSession:
             config.get("options", {}).get("scan_interval", self.config.scanInterval)
         )
 
+        if config.get("loginCache"):
+            LOGIN_CACHE.setFile(config["loginCache"])
+
+        secret = config.get("tokenSecret") or getattr(self.auth, "password", None)
+        if config.get("tokenStore") and secret and not self.config.file:
+            self.tokenStore = HiveTokenStore(config["tokenStore"], secret)
+            if not self.tokenStore.available:
+                self.logger.warning(
+                    "Tokens will not be saved to the token store as the "
+                    "cryptography package is not installed, install "
+                    "pyhiveapi[crypto] to use it"
+                )
+
         if config != {}:
-            if config["tokens"] is not None and not self.config.file:
+            if config.get("tokens") is not None and not self.config.file:
                 await self.updateTokens(config["tokens"])
-            elif not self.config.file:
-                raise HiveUnknownConfiguration
+            elif not self.config.file and not await self.loadTokens():
+                result = await self.login()
+                if "AuthenticationResult" not in (result or {}):
+                    raise HiveReauthRequired(result)
+
+        self.config.longLived = config.get("longLived", self.config.longLived)
+        self.config.snapshotFile = config.get("snapshot", self.config.snapshotFile)
+        if not self.config.file and await self.loadSnapshot():
+            self.startupTask = asyncio.ensure_future(self.getDevices("No_ID"))
+            return self.deviceList
 
         try:
             await self.getDevices("No_ID")
@@ -416,27 +1115,26 @@ class HiveSession:
             p = self.data.products[aProduct]
             if p.get("isGroup", False):
                 continue
-            product_list = PRODUCTS.get(self.data.products[aProduct]["type"], [])
-            for code in product_list:
-                eval("self." + code)
+            for build in PRODUCT_ENTITIES.get(p["type"], ()):
+                build(self, p)
 
-            if self.data.products[aProduct]["type"] in hive_type:
+            if p["type"] in hive_type:
                 self.config.mode.append(p["id"])
 
         hive_type = HIVE_TYPES["Thermo"] + HIVE_TYPES["Sensor"]
         for aDevice in self.data["devices"]:
             d = self.data.devices[aDevice]
-            device_list = DEVICES.get(self.data.devices[aDevice]["type"], [])
-            for code in device_list:
-                eval("self." + code)
+            for build in DEVICE_ENTITIES.get(d["type"], ()):
+                build(self, d)
 
-            if self.data["devices"][aDevice]["type"] in hive_type:
+            if d["type"] in hive_type:
                 self.config.battery.append(d["id"])
 
         if "action" in HIVE_TYPES["Switch"]:
             for action in self.data["actions"]:
-                a = self.data["actions"][action]  # noqa: F841
-                eval("self." + ACTIONS)
+                a = self.data["actions"][action]
+                for build in ACTION_ENTITIES:
+                    build(self, a)
 
         return self.deviceList
 
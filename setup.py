@@ -32,5 +32,8 @@ setup(
         )
     },
     install_requires=requirements_from_file(),
-    extras_require={"dev": requirements_from_file("requirements_test.txt")},
+    extras_require={
+        "crypto": ["cryptography"],
+        "dev": requirements_from_file("requirements_test.txt"),
+    },
 )
@@ -0,0 +1,7 @@
+"""Configure pytest for pyhiveapi."""
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "pyhiveapi")
+)
@@ -0,0 +1,69 @@
+"""Test the API circuit breaker."""
+import asyncio
+
+import pytest
+from aiohttp import ClientSession, web
+
+from apyhiveapi.api.hive_async_api import HiveApiAsync
+from apyhiveapi.api.hive_breaker import HALF_OPEN, OPEN, HiveCircuitBreaker
+from apyhiveapi.helper.hive_exceptions import HiveCircuitOpen
+
+
+def test_breaker_opens_and_recovers():
+    """Test the breaker opens after failures and closes after a good trial."""
+    breaker = HiveCircuitBreaker(failureThreshold=2, resetTimeout=0)
+
+    breaker.failure()
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.state == OPEN
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.success()
+    assert breaker.allow()
+    assert breaker.status()["failures"] == 0
+
+
+def test_breaker_cancelled_trial():
+    """Test a cancelled half-open trial lets the next request through."""
+
+    async def handler(request):
+        await asyncio.sleep(float(request.query.get("delay", 0)))
+        return web.json_response({})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}/"
+
+        async with ClientSession() as websession:
+            api = HiveApiAsync(websession=websession)
+            api.breakerSettings = {"failureThreshold": 1, "resetTimeout": 0.05}
+            api.getBreaker("all").failure()
+            await asyncio.sleep(0.1)
+
+            trial = asyncio.ensure_future(
+                api.request("get", url + "?delay=1", token="token", endpoint="all")
+            )
+            await asyncio.sleep(0.05)
+            with pytest.raises(HiveCircuitOpen):
+                await api.request("get", url, token="token", endpoint="all")
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+            resp = await api.request("get", url, token="token", endpoint="all")
+            assert resp["original"] == 200
+            assert api.breakers["all"].status()["state"] == "closed"
+
+        await runner.cleanup()
+
+    asyncio.run(run())
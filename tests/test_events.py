@@ -0,0 +1,47 @@
+"""Test the change events."""
+import asyncio
+from unittest.mock import MagicMock
+
+from apyhiveapi.helper.hive_events import HiveEvents
+
+
+def test_events_watch_drops_oldest():
+    """Test a watcher that falls behind keeps the latest events."""
+
+    async def run():
+        events = HiveEvents(MagicMock(), queueSize=2)
+        watcher = events.watch()
+        first = asyncio.ensure_future(watcher.__anext__())
+        await asyncio.sleep(0)
+        events.publish("products", "node", {"value": -1}, {"value": 0})
+        seen = [(await first).changes[0].new]
+
+        for value in range(1, 5):
+            events.publish("products", "node", {"value": -1}, {"value": value})
+        seen.append((await watcher.__anext__()).changes[0].new)
+        seen.append((await watcher.__anext__()).changes[0].new)
+        await watcher.aclose()
+        return seen
+
+    assert asyncio.run(run()) == [0, 3, 4]
+
+
+def test_events_coroutine_listener_error_logged():
+    """Test errors from coroutine listeners are logged."""
+    session = MagicMock()
+
+    async def listener(event):
+        raise ValueError("listener")
+
+    async def run():
+        events = HiveEvents(session)
+        events.addListener(listener)
+        events.publish("products", "node", None, {"value": 1})
+        assert len(events.tasks) == 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return events
+
+    events = asyncio.run(run())
+    assert not events.tasks
+    session.logger.error.assert_called_once()
@@ -0,0 +1,99 @@
+"""Test the entity factories."""
+from apyhiveapi.helper.hive_factory import (
+    ACTION_ENTITIES,
+    DEVICE_ENTITIES,
+    PRODUCT_ENTITIES,
+)
+
+# Entity tables as they were written before the factories, evaluated with eval.
+EVAL_PRODUCTS = {
+    "heating": [
+        'addList("climate", p, temperatureunit=self.data["user"]["temperatureUnit"])',
+        'addList("switch", p, haName=" Heat on Demand", hiveType="Heating_Heat_On_Demand")',
+        'addList("sensor", p, haName=" Current Temperature", hiveType="Heating_Current_Temperature", custom=True)',
+        'addList("sensor", p, haName=" Target Temperature", hiveType="Heating_Target_Temperature", custom=True)',
+        'addList("sensor", p, haName=" State", hiveType="Heating_State", custom=True)',
+        'addList("sensor", p, haName=" Mode", hiveType="Heating_Mode", custom=True)',
+        'addList("sensor", p, haName=" Boost", hiveType="Heating_Boost", custom=True)',
+    ],
+    "hotwater": [
+        'addList("water_heater", p,)',
+        'addList("sensor", p, haName="Hotwater State", hiveType="Hotwater_State", custom=True)',
+        'addList("sensor", p, haName="Hotwater Mode", hiveType="Hotwater_Mode", custom=True)',
+        'addList("sensor", p, haName="Hotwater Boost", hiveType="Hotwater_Boost", custom=True)',
+    ],
+    "activeplug": [
+        'addList("switch", p)',
+        'addList("sensor", p, haName=" Mode", hiveType="Mode", custom=True)',
+        'addList("sensor", p, haName=" Availability", hiveType="Availability", custom=True)',
+    ],
+}
+EVAL_DEVICES = {
+    "hub": [
+        'addList("binary_sensor", d, haName="Hive Hub Status", hiveType="Connectivity")',
+    ],
+    "siren": ['addList("alarm_control_panel", d)'],
+    "trv": [
+        'addList("sensor", d, haName=" Battery Level", hiveType="Battery")',
+        'addList("sensor", d, haName=" Availability", hiveType="Availability", custom=True)',
+    ],
+}
+EVAL_ACTION = (
+    'addList("switch", a, hiveName=a["name"], haName=a["name"], hiveType="action")'
+)
+
+
+class RecordingSession:
+    """Session that records the entities added."""
+
+    def __init__(self):
+        """Initialise the recording session."""
+        self.data = {"user": {"temperatureUnit": "C"}}
+        self.calls = []
+
+    def addList(self, entityType, data, **kwargs):
+        """Record an entity."""
+        self.calls.append((entityType, data["id"], kwargs))
+        return True
+
+
+def evalEntities(codes, node):
+    """Add entities the way they were added before the factories."""
+    session = RecordingSession()
+    for code in codes:
+        eval(  # nosec
+            "self." + code, {}, {"self": session, "p": node, "d": node, "a": node}
+        )
+    return session.calls
+
+
+def buildEntities(factories, node):
+    """Add entities with the compiled factories."""
+    session = RecordingSession()
+    for build in factories:
+        build(session, node)
+    return session.calls
+
+
+def test_product_factories_match_eval():
+    """Test product factories add the same entities as the eval table."""
+    for nodeType, codes in EVAL_PRODUCTS.items():
+        node = {"id": nodeType + "-id", "type": nodeType}
+        assert buildEntities(PRODUCT_ENTITIES[nodeType], node) == evalEntities(
+            codes, node
+        )
+
+
+def test_device_factories_match_eval():
+    """Test device factories add the same entities as the eval table."""
+    for nodeType, codes in EVAL_DEVICES.items():
+        node = {"id": nodeType + "-id", "type": nodeType}
+        assert buildEntities(DEVICE_ENTITIES[nodeType], node) == evalEntities(
+            codes, node
+        )
+
+
+def test_action_factory_matches_eval():
+    """Test the action factory adds the same entity as the eval table."""
+    node = {"id": "action-id", "name": "Morning"}
+    assert buildEntities(ACTION_ENTITIES, node) == evalEntities([EVAL_ACTION], node)
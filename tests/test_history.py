@@ -0,0 +1,55 @@
+"""Test the temperature history."""
+import random
+
+import pytest
+
+from apyhiveapi.helper.hive_history import HiveTemperatureHistory
+
+
+def test_history_evicts_oldest_samples():
+    """Test min and max only cover the samples still held."""
+    history = HiveTemperatureHistory(size=5, windows={"all": 10**9})
+    for timestamp, temperature in enumerate([1, 9, 5, 3, 7, 4, 6]):
+        history.add(timestamp, temperature)
+
+    assert len(history) == 5
+    assert history.samples() == [[2, 5], [3, 3], [4, 7], [5, 4], [6, 6]]
+    assert history.stats("all") == {"min": 3, "max": 7, "mean": 5, "count": 5}
+    assert history.minMax()["RestartMin"] == 1
+    assert history.minMax()["RestartMax"] == 9
+
+
+def test_history_windows_match_scan():
+    """Test rolling stats match a scan of the samples in each window."""
+    rng = random.Random(0)
+    windows = {"short": 30, "long": 120}
+    history = HiveTemperatureHistory(size=50, windows=windows)
+    samples = []
+    timestamp = 0.0
+
+    for _ in range(500):
+        timestamp += rng.choice([1, 5, 10, 40])
+        temperature = round(rng.uniform(15, 25), 1)
+        history.add(timestamp, temperature)
+        samples = (samples + [(timestamp, temperature)])[-50:]
+
+        for name, seconds in windows.items():
+            held = [value for time, value in samples if time > timestamp - seconds]
+            stats = history.stats(name)
+            assert stats["count"] == len(held)
+            assert stats["min"] == min(held)
+            assert stats["max"] == max(held)
+            assert stats["mean"] == pytest.approx(sum(held) / len(held))
+
+
+def test_history_round_trip():
+    """Test history restored from a dict has the same samples and stats."""
+    history = HiveTemperatureHistory(size=5, windows={"all": 10**9})
+    for timestamp, temperature in enumerate([1, 9, 5, 3, 7, 4, 6]):
+        history.add(timestamp, temperature)
+
+    restored = HiveTemperatureHistory.fromDict(history.toDict())
+
+    assert restored.samples() == history.samples()
+    assert restored.stats("all") == history.stats("all")
+    assert restored.minMax()["RestartMin"] is None
@@ -0,0 +1,115 @@
+"""Test the compiled schedules."""
+from datetime import datetime
+
+from apyhiveapi.helper.hive_schedule import DAYS, HiveSchedule
+
+# 2024-01-01 is a Monday.
+MONDAY = datetime(2024, 1, 1)
+
+
+def makeSchedule():
+    """Make a schedule with a morning and evening slot each day."""
+    return {
+        name: [
+            {"start": 390, "value": {"target": 20 + day}},
+            {"start": 1320, "value": {"target": 10 + day}},
+        ]
+        for day, name in enumerate(DAYS)
+    }
+
+
+def slot(result):
+    """Get the target and times of a slot."""
+    return (
+        result["value"]["target"],
+        result["Start_DateTime"],
+        result["End_DateTime"],
+    )
+
+
+def test_schedule_week_wrap():
+    """Test the slots after the last slot of the week come from Monday."""
+    schedule = HiveSchedule(makeSchedule())
+    result = schedule.nowNextLater(datetime(2024, 1, 7, 23, 30))
+
+    assert slot(result["now"]) == (
+        16,
+        datetime(2024, 1, 7, 22, 0),
+        datetime(2024, 1, 8, 6, 30),
+    )
+    assert slot(result["next"]) == (
+        20,
+        datetime(2024, 1, 8, 6, 30),
+        datetime(2024, 1, 8, 22, 0),
+    )
+    assert slot(result["later"]) == (
+        10,
+        datetime(2024, 1, 8, 22, 0),
+        datetime(2024, 1, 9, 6, 30),
+    )
+
+
+def test_schedule_slot_from_previous_week():
+    """Test early Monday is still in the last slot of the previous week."""
+    schedule = HiveSchedule(makeSchedule())
+    result = schedule.nowNextLater(datetime(2024, 1, 1, 0, 10))
+
+    assert slot(result["now"]) == (
+        16,
+        datetime(2023, 12, 31, 22, 0),
+        datetime(2024, 1, 1, 6, 30),
+    )
+    assert slot(result["next"])[0] == 20
+
+
+def test_schedule_day_boundaries():
+    """Test a slot starts exactly at its start minute."""
+    schedule = HiveSchedule(makeSchedule())
+
+    before = schedule.nowNextLater(datetime(2024, 1, 2, 6, 29))
+    at = schedule.nowNextLater(datetime(2024, 1, 2, 6, 30))
+    midnight = schedule.nowNextLater(datetime(2024, 1, 3, 0, 0))
+
+    assert before["now"]["value"]["target"] == 10
+    assert before["next"]["Start_DateTime"] == datetime(2024, 1, 2, 6, 30)
+    assert slot(at["now"]) == (
+        21,
+        datetime(2024, 1, 2, 6, 30),
+        datetime(2024, 1, 2, 22, 0),
+    )
+    assert midnight["now"]["value"]["target"] == 11
+    assert midnight["next"]["Start_DateTime"] == datetime(2024, 1, 3, 6, 30)
+
+
+def test_schedule_empty():
+    """Test an empty schedule has no slots."""
+    schedule = HiveSchedule({name: [] for name in DAYS})
+
+    assert schedule.nowNextLater(MONDAY) is None
+
+
+def test_schedule_timeline_across_week():
+    """Test the timeline steps are cut to the range across the week end."""
+    schedule = HiveSchedule(makeSchedule())
+    steps = schedule.timeline(datetime(2024, 1, 7, 20, 0), datetime(2024, 1, 8, 12, 0))
+
+    assert [
+        (step["start"], step["end"], step["value"]["target"]) for step in steps
+    ] == [
+        (datetime(2024, 1, 7, 20, 0), datetime(2024, 1, 7, 22, 0), 26),
+        (datetime(2024, 1, 7, 22, 0), datetime(2024, 1, 8, 6, 30), 16),
+        (datetime(2024, 1, 8, 6, 30), datetime(2024, 1, 8, 12, 0), 20),
+    ]
+    assert schedule.timeline(MONDAY, MONDAY) == []
+
+
+def test_schedule_values_at():
+    """Test values at datetimes and epoch times match the timeline."""
+    schedule = HiveSchedule(makeSchedule())
+    times = [
+        datetime(2024, 1, 1, 0, 0),
+        datetime(2024, 1, 1, 6, 30),
+        datetime(2024, 1, 5, 23, 59).timestamp(),
+    ]
+
+    assert [value["target"] for value in schedule.valuesAt(times)] == [16, 20, 14]
@@ -0,0 +1,27 @@
+"""Test the token store."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from apyhiveapi.helper.hive_token_store import HiveTokenStore  # noqa: E402
+
+
+def test_token_store_concurrent_saves(tmp_path):
+    """Test concurrent saves to one file keep every account."""
+    store = HiveTokenStore(str(tmp_path / "tokens.json"), "secret")
+    accounts = [f"user{i}@example.com" for i in range(40)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda username: store.save(username, {"tokenData": username}),
+                accounts,
+            )
+        )
+
+    assert all(results)
+    for username in accounts:
+        assert store.load(username) == {"tokenData": username}
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,52 @@
+"""Test polls that fail at the transport."""
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp import ClientSession, web
+
+from apyhiveapi.api.hive_retry import HiveRetryPolicy
+from apyhiveapi.session import HiveSession
+
+
+async def dropConnection(request):
+    """Close the connection without a response."""
+    request.transport.close()
+    await asyncio.sleep(1)
+    return web.json_response({})
+
+
+async def slowResponse(request):
+    """Respond after the client has timed out."""
+    await asyncio.sleep(1)
+    return web.json_response({})
+
+
+@pytest.mark.parametrize("handler", [dropConnection, slowResponse])
+def test_fetch_devices_transport_error(handler):
+    """Test a poll that keeps failing at the transport is unsuccessful."""
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/all", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+
+        async with ClientSession() as websession:
+            session = HiveSession(websession=websession)
+            session.hiveRefreshTokens = AsyncMock(return_value=None)
+            session.tokens.tokenData = {"token": "token"}
+            session.api.urls["all"] = f"http://127.0.0.1:{port}/all"
+            session.api.timeout = 0.1
+            session.api.retryPolicies["poll"] = HiveRetryPolicy(retries=1, base=0.01)
+
+            result = await session.fetchDevices("No_ID")
+            failures = session.api.breakers["all"].status()["failures"]
+
+        await runner.cleanup()
+        return result, failures
+
+    assert asyncio.run(run()) == (False, 1)
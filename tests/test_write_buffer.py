@@ -0,0 +1,53 @@
+"""Test the write buffer."""
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from apyhiveapi.helper.hive_write_buffer import HiveWriteBuffer
+
+
+def make_buffer():
+    """Make a write buffer with a mock session."""
+    session = MagicMock()
+    session.config.writeWindow = timedelta(seconds=0.05)
+    session.sendState = AsyncMock(return_value={"original": 200})
+    return HiveWriteBuffer(session)
+
+
+def test_write_buffer_merges_writes():
+    """Test writes to one node within the window are sent once."""
+    buffer = make_buffer()
+
+    async def run():
+        return await asyncio.gather(
+            buffer.add("heating", "node", {"mode": "SCHEDULE"}),
+            buffer.add("heating", "node", {"target": 20}),
+        )
+
+    assert asyncio.run(run()) == [{"original": 200}] * 2
+    buffer.session.sendState.assert_awaited_once_with(
+        "heating", "node", mode="SCHEDULE", target=20
+    )
+    assert not buffer.pending
+    assert not buffer.tasks
+
+
+@pytest.mark.parametrize("delay", [0, 0.01])
+def test_write_buffer_close_cancels_writes(delay):
+    """Test closing cancels waiting writes and later writes still send."""
+    buffer = make_buffer()
+
+    async def run():
+        write = asyncio.ensure_future(buffer.add("heating", "node", {"target": 20}))
+        await asyncio.sleep(delay)
+        await buffer.close()
+        with pytest.raises(asyncio.CancelledError):
+            await write
+        assert not buffer.pending
+
+        return await asyncio.wait_for(buffer.add("heating", "node", {"target": 21}), 1)
+
+    assert asyncio.run(run()) == {"original": 200}
+    buffer.session.sendState.assert_awaited_once_with("heating", "node", target=21)